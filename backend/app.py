@@ -1,12 +1,26 @@
-from flask import Flask, request, jsonify
+# 시작 시간 측정 기준점 (가장 먼저 import)
+from utils.startup import startup_report, PROCESS_START
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
 from flask_cors import CORS
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.middleware.proxy_fix import ProxyFix
 import time
 import os
+import json
 import logging
-from utils.image_extractor import ImageExtractor
+import threading
 from utils.template_generator import TemplateGenerator
+from utils.job_manager import JobManager, JobQueueFull
+from utils.ocr_cache import OCRCache
+from utils.result_cache import ResultCache
+from utils.image_store import ImageStore
+from utils.result_store import ResultStore
+from utils.encode_pool import EncodePool
+from utils.upload_spool import UploadSpool
 
 app = Flask(__name__)
+# Railway 프록시 뒤에서 https / 호스트명을 올바르게 인식
+app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 CORS(app, origins=["https://www.cataleaf.com", "https://cataleaf.com"])
 
 logging.basicConfig(level=logging.INFO)
@@ -15,109 +29,378 @@ logger = logging.getLogger(__name__)
 UPLOAD_FOLDER = '/tmp'
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
-@app.route('/api/parse-pdf', methods=['POST'])
-def parse_pdf():
+# 업로드 PDF는 임시 파일로 받아 경로로 처리 (요청마다 PDF 전체를 메모리에 두지 않음)
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', '100'))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+upload_spool = UploadSpool(UPLOAD_FOLDER)
+upload_spool.cleanup()
+
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', '2'))
+JOB_MAX_PENDING = int(os.environ.get('JOB_MAX_PENDING', '8'))
+job_manager = JobManager(max_workers=JOB_WORKERS, max_pending=JOB_MAX_PENDING)
+
+# 페이지 병렬 처리 프로세스 수 (1 = 단일 프로세스)
+EXTRACT_PROCESSES = int(os.environ.get('EXTRACT_PROCESSES', '1'))
+
+# 추출 중 프로세스 RSS 상한 (MB, 0 = 제한 없음), 정리 후에도 넘으면 해당 요청 실패
+MAX_RSS_MB = int(os.environ.get('MAX_RSS_MB', '0'))
+
+# 썸네일 / 미리보기 인코딩 스레드 (프로세스 내 모든 요청이 공유하는 상한)
+ENCODE_THREADS = int(os.environ.get('ENCODE_THREADS', str(min(4, os.cpu_count() or 1))))
+ENCODE_MAX_PENDING = int(os.environ.get('ENCODE_MAX_PENDING', '64'))
+encode_pool = EncodePool(max_workers=ENCODE_THREADS, max_pending=ENCODE_MAX_PENDING)
+
+# OCR 결과 캐시 (모든 워커가 같은 SQLite 파일 공유)
+OCR_CACHE_PATH = os.environ.get('OCR_CACHE_PATH', os.path.join(UPLOAD_FOLDER, 'ocr-cache.sqlite3'))
+OCR_CACHE_MAX_MB = int(os.environ.get('OCR_CACHE_MAX_MB', '256'))
+ocr_cache = OCRCache(OCR_CACHE_PATH, max_bytes=OCR_CACHE_MAX_MB * 1024 * 1024)
+
+# 같은 PDF 재업로드 시 추출 결과 재사용 (동시 업로드는 한 번만 계산)
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', '8'))
+result_cache = ResultCache(max_entries=RESULT_CACHE_SIZE)
+
+# 이미지 URL 앞에 붙일 공개 주소 (없으면 요청 호스트 사용)
+PUBLIC_BASE_URL = os.environ.get('PUBLIC_BASE_URL', '').rstrip('/')
+
+# 전체 추출 결과 저장소 (페이지 단위 조회용, 모든 워커 공유)
+RESULT_STORE_PATH = os.environ.get('RESULT_STORE_PATH', os.path.join(UPLOAD_FOLDER, 'results'))
+RESULT_TTL_HOURS = int(os.environ.get('RESULT_TTL_HOURS', '24'))
+result_store = ResultStore(RESULT_STORE_PATH, ttl_seconds=RESULT_TTL_HOURS * 3600)
+
+# 제품 이미지 저장소 (/img/<hash>로 제공, 모든 워커가 같은 디렉터리 공유)
+# 결과 / 결과 캐시가 이미지 URL을 참조하므로 배포 시 IMAGE_STORE_PATH(와 RESULT_STORE_PATH)는
+# 재배포 후에도 남는 영구 볼륨으로 지정할 것 (/tmp 기본값은 재배포 때 사라짐)
+# 결과 보관 기간(RESULT_TTL_HOURS) 안에 사용된 이미지는 용량을 넘어도 정리하지 않음
+IMAGE_STORE_PATH = os.environ.get('IMAGE_STORE_PATH', os.path.join(UPLOAD_FOLDER, 'image-store'))
+IMAGE_STORE_MAX_MB = int(os.environ.get('IMAGE_STORE_MAX_MB', '1024'))
+image_store = ImageStore(
+    IMAGE_STORE_PATH,
+    max_bytes=IMAGE_STORE_MAX_MB * 1024 * 1024,
+    retain_seconds=RESULT_TTL_HOURS * 3600
+)
+
+PAGE_SIZE = 30
+MAX_PAGE_SIZE = 100
+
+# 다운로드 가능한 HTML 파일 → TemplateGenerator 메서드
+SITE_FILES = {
+    'index.html': 'generate_index_html',
+    'admin.html': 'generate_admin_html',
+}
+
+
+def _get_uploaded_pdf():
+    """요청에서 PDF 파일 꺼내기 → (pdf_file, 오류 응답)"""
+    if 'pdf' not in request.files:
+        logger.error("❌ PDF 파일이 요청에 없음")
+        return None, (jsonify({'error': 'PDF 파일이 없습니다'}), 400)
+    
+    pdf_file = request.files['pdf']
+    logger.info(f"📄 파일명: {pdf_file.filename}")
+    
+    if pdf_file.filename == '':
+        logger.error("❌ 파일이 선택되지 않음")
+        return None, (jsonify({'error': '파일이 선택되지 않았습니다'}), 400)
+    
+    if not pdf_file.filename.endswith('.pdf'):
+        logger.error("❌ PDF 파일이 아님")
+        return None, (jsonify({'error': 'PDF 파일만 업로드 가능합니다'}), 400)
+    
+    return pdf_file, None
+
+
+def _spool_uploaded_pdf():
+    """업로드 PDF → 임시 파일 → (pdf_path, 파일명, 오류 응답)
+
+    임시 파일은 호출한 쪽에서 처리 후 upload_spool.remove()로 삭제
+    """
+    pdf_file, error_response = _get_uploaded_pdf()
+    if error_response:
+        return None, None, error_response
+    
+    pdf_path = upload_spool.save(pdf_file)
+    file_size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
+    logger.info(f"📊 파일 크기: {file_size_mb:.2f} MB")
+    return pdf_path, pdf_file.filename, None
+
+
+@app.errorhandler(413)
+def upload_too_large(e):
+    logger.error(f"❌ 업로드 크기 초과 (최대 {MAX_UPLOAD_MB}MB)")
+    return jsonify({'error': f'파일이 너무 큽니다 (최대 {MAX_UPLOAD_MB}MB)'}), 413
+
+
+_extractor = None
+_extractor_lock = threading.Lock()
+
+
+def get_extractor():
+    """워커 프로세스 공용 추출기 (첫 요청 때 한 번 생성, 스레드 간 공유)
+
+    요청별 설정은 get_extractor().with_config(...)로 분리
+    """
+    global _extractor
+    if _extractor is None:
+        with _extractor_lock:
+            if _extractor is None:
+                # fitz / PIL / numpy는 여기서 처음 import (워커 부팅 시간에서 제외)
+                image_extractor = startup_report.timed_import('utils.image_extractor')
+                with startup_report.measure('init extractor (Vision client)'):
+                    extractor = image_extractor.ImageExtractor(
+                        ocr_cache=ocr_cache, image_store=image_store, encode_pool=encode_pool
+                    )
+                extractor.config['parallel_workers'] = EXTRACT_PROCESSES
+                extractor.config['max_rss_mb'] = MAX_RSS_MB
+                _extractor = extractor
+    return _extractor
+
+
+# fork 전에 미리 import해도 안전한 무거운 모듈 (gunicorn --preload용)
+WARM_UP_MODULES = ('numpy', 'PIL.Image', 'fitz', 'utils.image_extractor')
+
+
+def warm_up_imports():
+    """무거운 모듈 미리 import (Vision 클라이언트 / 스레드는 만들지 않음 → fork 전 호출 가능)"""
+    for module_name in WARM_UP_MODULES:
+        startup_report.timed_import(module_name)
+
+
+def warm_up():
+    """워커 미리 초기화: 모듈 import + 추출기 / Vision 클라이언트 생성 (fork 이후 호출)"""
+    warm_up_imports()
+    get_extractor()
+    startup_report.log(logger)
+
+
+def _public_base_url():
+    """이미지 URL용 공개 주소"""
+    return PUBLIC_BASE_URL or request.host_url.rstrip('/')
+
+
+def _format_product(product, number, base_url=''):
+    """추출된 제품 → API 제품 형식"""
+    product_number = f'PROD_{str(number).zfill(4)}'
+    
+    # 저장소 이미지는 상대 경로로 캐시되므로 응답 시점에 절대 URL로 변환
+    image = product['image']
+    if image.startswith(ImageStore.URL_PATH):
+        image = base_url + image
+    
+    formatted = {
+        'name': product.get('name', '제품'),
+        'productNumber': product_number,
+        'images': [image],
+        'specs': '\n'.join(product.get('specs', [])),
+        'specsList': product.get('specs', [])[:5] or ['사양 정보'],
+        'categories': {
+            'productType': 'DOWNLIGHT',
+            'watt': '10W',
+            'cct': '3000K',
+            'ip': 'IP20'
+        },
+        'tableData': {
+            'model': product_number,
+            'watt': '10W',
+            'voltage': '220V',
+            'cct': '3000K',
+            'cri': '90+',
+            'ip': 'IP20'
+        }
+    }
+    
+    # 폭별 변형 (srcset): "<url> <폭>w, ..."
+    srcset = product.get('image_srcset')
+    if srcset:
+        formatted['imageSrcset'] = ', '.join(
+            base_url + entry if entry.startswith(ImageStore.URL_PATH) else entry
+            for entry in srcset.split(', ')
+        )
+    
+    return formatted
+
+
+def _format_products(page_results, base_url=''):
+    """모든 페이지의 제품을 하나의 리스트로 합치기"""
+    all_products = []
+    for page_data in page_results:
+        for product in page_data['products']:
+            all_products.append(_format_product(product, len(all_products) + 1, base_url))
+    return all_products
+
+
+def _store_image_hashes(page_results):
+    """페이지 결과가 참조하는 저장소 이미지 해시"""
+    hashes = set()
+    for page_data in page_results:
+        for product in page_data['products']:
+            urls = [product.get('image', '')]
+            if product.get('image_srcset'):
+                urls += [entry.split(' ')[0] for entry in product['image_srcset'].split(', ')]
+            hashes.update(filter(None, map(ImageStore.hash_from_url, urls)))
+    return hashes
+
+
+def _inline_store_images(products):
+    """제품 이미지의 저장소 URL → data URI (다운로드용 HTML이 서버 없이도 보이도록)
+
+    srcset은 제외 (저장소 URL만 가리키므로)
+    """
+    data_uris = {}
+    inlined = []
+    for product in products:
+        images = []
+        for url in product['images']:
+            image_hash = ImageStore.hash_from_url(url)
+            if image_hash is not None:
+                if image_hash not in data_uris:
+                    data_uris[image_hash] = image_store.data_uri(image_hash) or url
+                url = data_uris[image_hash]
+            images.append(url)
+        
+        product = {**product, 'images': images}
+        product.pop('imageSrcset', None)
+        inlined.append(product)
+    return inlined
+
+
+def _wants_page_artifacts():
+    """요청 플래그 (?artifacts=1 또는 form artifacts=1) → 페이지 미리보기 / 디버그 이미지 포함"""
+    value = request.args.get('artifacts', request.form.get('artifacts', ''))
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def _process_pdf(pdf_path, filename, base_url='', progress=None, page_artifacts=False):
+    """제품 추출 + HTML 생성 → 응답 데이터
+
+    page_artifacts가 False면 페이지 미리보기 / 디버그 이미지를 만들지 않음
+    (필요하면 /api/results/<id>/pages/<n>/debug 에서 나중에 생성)
+    """
     start_time = time.time()
     
+    # 이미지 추출
+    logger.info("🔍 제품 추출 시작...")
+    extractor = get_extractor().with_config(page_artifacts=page_artifacts)
+    source_hash = ResultCache.source_hash(pdf_path)
+    cache_key = ResultCache.make_key(
+        source_hash, {**extractor.config, 'use_vision': extractor.use_vision}
+    )
+    page_results = result_cache.get_or_compute(
+        cache_key,
+        lambda: extractor.extract_from_pdf(pdf_path, progress_callback=progress)
+    )
+    # 결과 캐시 적중(또는 같은 PDF의 다른 요청 결과 대기)이면 진행 콜백이 호출되지 않음
+    # → 완료 상태를 직접 보고 (페이지 결과는 페이지당 하나)
+    if progress:
+        progress(len(page_results), len(page_results))
+    
+    # 캐시된 결과를 다시 쓰면 이미지 사용 시각 갱신 (새 결과의 보관 기간 동안 유지)
+    image_store.touch(_store_image_hashes(page_results))
+    
+    all_products = _format_products(page_results, base_url)
+    
+    logger.info(f"✅ 총 {len(all_products)}개 제품 추출 완료")
+    
+    # 처음 5개 제품만 로그 출력
+    for i, p in enumerate(all_products[:5]):
+        logger.info(f"  제품 {i+1}: {p['name']}")
+    
+    # 페이징 처리 (30개씩)
+    page_size = PAGE_SIZE
+    total_pages = (len(all_products) + page_size - 1) // page_size
+    
+    logger.info(f"📦 총 {total_pages}페이지 (페이지당 {page_size}개)")
+    
+    # 첫 페이지 제품만 전송
+    paginated_products = all_products[:page_size]
+    
+    # 회사명 추출
+    company_name = filename.replace('.pdf', '').upper()
+    logger.info(f"🏢 회사명: {company_name}")
+    
+    # HTML 생성
+    logger.info("🌐 HTML 생성 시작...")
+    # 응답에는 저장소 이미지 URL 그대로 (독립 실행 HTML은 /api/results/<id>/site/<파일> 다운로드 시 생성)
+    generator = TemplateGenerator(company_name, all_products)
+    index_html = generator.generate_index_html()
+    admin_html = generator.generate_admin_html()
+    logger.info("✅ HTML 생성 완료")
+    
+    # 전체 결과는 서버에 보관하고 나머지 페이지는 요청 시 조회
+    result_id = result_store.create()
+    result_store.save(result_id, {
+        'result_id': result_id,
+        'company_name': company_name,
+        'created_at': time.time(),
+        'products': all_products
+    })
+    # 디버그 이미지를 나중에 생성할 수 있도록 원본(내용 해시당 한 벌)과 페이지 레이아웃 보관
+    result_store.save_source(result_id, source_hash, pdf_path)
+    result_store.save(result_id, [
+        {'page': page_data['page'], 'overlay': page_data['overlay']}
+        for page_data in page_results
+    ], ResultStore.PAGES_FILE)
+    logger.info(f"🗂️ 결과 저장: {result_id}")
+    
+    processing_time = round(time.time() - start_time, 2)
+    logger.info(f"⏱️ 총 처리 시간: {processing_time}초")
+    
+    response = {
+        'success': True,
+        'result_id': result_id,
+        'products_url': f'/api/results/{result_id}/products',
+        'site_urls': {
+            name: f'/api/results/{result_id}/site/{name}' for name in SITE_FILES
+        },
+        'products_count': len(all_products),
+        'total_pages': total_pages,
+        'current_page': 1,
+        'page_size': page_size,
+        'images_count': sum(len(p['images']) for p in all_products),
+        'processing_time': processing_time,
+        'index_html': index_html,
+        'admin_html': admin_html,
+        'products': paginated_products  # 첫 30개만
+    }
+    
+    if page_artifacts:
+        response['pages'] = [
+            {
+                'page': page_data['page'],
+                'image': page_data['image'],
+                'debug_image': page_data['debug_image']
+            }
+            for page_data in page_results
+        ]
+    
+    return response
+
+
+def _process_upload(pdf_path, filename, base_url='', progress=None, page_artifacts=False):
+    """업로드 임시 파일 처리 후 삭제"""
+    try:
+        return _process_pdf(pdf_path, filename, base_url, progress, page_artifacts)
+    finally:
+        upload_spool.remove(pdf_path)
+
+
+@app.route('/api/parse-pdf', methods=['POST'])
+def parse_pdf():
     logger.info("=" * 50)
     logger.info("📥 PDF 업로드 요청 받음")
     
     try:
-        if 'pdf' not in request.files:
-            logger.error("❌ PDF 파일이 요청에 없음")
-            return jsonify({'error': 'PDF 파일이 없습니다'}), 400
-        
-        pdf_file = request.files['pdf']
-        logger.info(f"📄 파일명: {pdf_file.filename}")
-        
-        if pdf_file.filename == '':
-            logger.error("❌ 파일이 선택되지 않음")
-            return jsonify({'error': '파일이 선택되지 않았습니다'}), 400
-        
-        if not pdf_file.filename.endswith('.pdf'):
-            logger.error("❌ PDF 파일이 아님")
-            return jsonify({'error': 'PDF 파일만 업로드 가능합니다'}), 400
-        
-        pdf_bytes = pdf_file.read()
-        file_size_mb = len(pdf_bytes) / (1024 * 1024)
-        logger.info(f"📊 파일 크기: {file_size_mb:.2f} MB")
-        
-        # 이미지 추출
-        logger.info("🔍 제품 추출 시작...")
-        extractor = ImageExtractor()
-        page_results = extractor.extract_from_pdf(pdf_bytes)
-        
-        # 모든 페이지의 제품을 하나의 리스트로 합치기
-        all_products = []
-        for page_data in page_results:
-            for product in page_data['products']:
-                # 제품 형식 변환
-                formatted_product = {
-                    'name': product.get('name', '제품'),
-                    'productNumber': f'PROD_{str(len(all_products) + 1).zfill(4)}',
-                    'images': [product['image']],
-                    'specs': '\n'.join(product.get('specs', [])),
-                    'specsList': product.get('specs', [])[:5] or ['사양 정보'],
-                    'categories': {
-                        'productType': 'DOWNLIGHT',
-                        'watt': '10W',
-                        'cct': '3000K',
-                        'ip': 'IP20'
-                    },
-                    'tableData': {
-                        'model': f'PROD_{str(len(all_products) + 1).zfill(4)}',
-                        'watt': '10W',
-                        'voltage': '220V',
-                        'cct': '3000K',
-                        'cri': '90+',
-                        'ip': 'IP20'
-                    }
-                }
-                all_products.append(formatted_product)
-        
-        logger.info(f"✅ 총 {len(all_products)}개 제품 추출 완료")
-        
-        # 처음 5개 제품만 로그 출력
-        for i, p in enumerate(all_products[:5]):
-            logger.info(f"  제품 {i+1}: {p['name']}")
-        
-        # 페이징 처리 (30개씩)
-        page_size = 30
-        total_pages = (len(all_products) + page_size - 1) // page_size
-        
-        logger.info(f"📦 총 {total_pages}페이지 (페이지당 {page_size}개)")
-        
-        # 첫 페이지 제품만 전송
-        paginated_products = all_products[:page_size]
+        pdf_path, filename, error_response = _spool_uploaded_pdf()
+        if error_response:
+            return error_response
         
-        # 회사명 추출
-        company_name = pdf_file.filename.replace('.pdf', '').upper()
-        logger.info(f"🏢 회사명: {company_name}")
-        
-        # HTML 생성
-        logger.info("🌐 HTML 생성 시작...")
-        generator = TemplateGenerator(company_name, all_products)
-        index_html = generator.generate_index_html()
-        admin_html = generator.generate_admin_html()
-        logger.info("✅ HTML 생성 완료")
-        
-        processing_time = round(time.time() - start_time, 2)
-        logger.info(f"⏱️ 총 처리 시간: {processing_time}초")
+        result = _process_upload(pdf_path, filename, _public_base_url(),
+                                 page_artifacts=_wants_page_artifacts())
         logger.info("=" * 50)
         
-        return jsonify({
-            'success': True,
-            'products_count': len(all_products),
-            'total_pages': total_pages,
-            'current_page': 1,
-            'page_size': page_size,
-            'images_count': sum(len(p['images']) for p in all_products),
-            'processing_time': processing_time,
-            'index_html': index_html,
-            'admin_html': admin_html,
-            'products': paginated_products  # 첫 30개만
-        })
+        return jsonify(result)
         
+    except RequestEntityTooLarge:
+        raise
     except Exception as e:
         logger.error(f"💥 오류 발생: {str(e)}")
         import traceback
@@ -126,10 +409,267 @@ def parse_pdf():
             'error': f'PDF 처리 중 오류 발생: {str(e)}'
         }), 500
 
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    logger.info("=" * 50)
+    logger.info("📥 PDF 작업 등록 요청 받음")
+    
+    pdf_path, filename, error_response = _spool_uploaded_pdf()
+    if error_response:
+        return error_response
+    
+    try:
+        # 임시 파일은 작업이 끝나면 _process_upload가 삭제
+        job_id = job_manager.submit(
+            _process_upload, pdf_path, filename, _public_base_url(),
+            page_artifacts=_wants_page_artifacts()
+        )
+    except JobQueueFull as e:
+        upload_spool.remove(pdf_path)
+        logger.error(f"⏳ 작업 대기열 가득 참: {e}")
+        return jsonify({'error': str(e)}), 503
+    
+    logger.info(f"🧾 작업 등록: {job_id}")
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': f'/api/jobs/{job_id}'
+    }), 202
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '작업을 찾을 수 없습니다'}), 404
+    return jsonify(job)
+
+def _stream_event(event, data, sse):
+    """스트리밍 이벤트 직렬화 (SSE 또는 NDJSON)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    if sse:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({'event': event, **data}, ensure_ascii=False) + "\n"
+
+
+@app.route('/api/parse-pdf/stream', methods=['POST'])
+def parse_pdf_stream():
+    """페이지가 끝날 때마다 제품을 바로 전송 (SSE / NDJSON)"""
+    logger.info("=" * 50)
+    logger.info("📥 PDF 스트리밍 요청 받음")
+    
+    pdf_path, filename, error_response = _spool_uploaded_pdf()
+    if error_response:
+        return error_response
+    
+    sse = (request.args.get('format') == 'sse' or
+           'text/event-stream' in request.headers.get('Accept', ''))
+    
+    base_url = _public_base_url()
+    page_artifacts = _wants_page_artifacts()
+    
+    def generate():
+        start_time = time.time()
+        products_count = 0
+        pages_count = 0
+        
+        try:
+            extractor = get_extractor().with_config(page_artifacts=page_artifacts)
+            
+            for page_data in extractor.iter_pages(pdf_path):
+                products = []
+                for product in page_data['products']:
+                    products_count += 1
+                    products.append(_format_product(product, products_count, base_url))
+                pages_count += 1
+                
+                event = {
+                    'page': page_data['page'],
+                    'layout_info': page_data['layout_info'],
+                    'products': products
+                }
+                if page_artifacts:
+                    event['image'] = page_data['image']
+                    event['debug_image'] = page_data['debug_image']
+                
+                yield _stream_event('page', event, sse)
+            
+            processing_time = round(time.time() - start_time, 2)
+            logger.info(f"✅ 스트리밍 완료: {pages_count}페이지, {products_count}개 제품 ({processing_time}초)")
+            
+            yield _stream_event('summary', {
+                'success': True,
+                'pages_count': pages_count,
+                'products_count': products_count,
+                'processing_time': processing_time
+            }, sse)
+            
+        except Exception as e:
+            logger.error(f"💥 스트리밍 중 오류 발생: {str(e)}")
+            yield _stream_event('error', {
+                'error': f'PDF 처리 중 오류 발생: {str(e)}'
+            }, sse)
+    
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    response = Response(
+        stream_with_context(generate()),
+        mimetype=mimetype,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # 스트림이 끝나거나 클라이언트가 끊으면 임시 파일 삭제
+    response.call_on_close(lambda: upload_spool.remove(pdf_path))
+    return response
+
+def _parse_positive_int(value, default):
+    """쿼리 파라미터 → 양의 정수 (잘못된 값은 None)"""
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        return None
+    return number if number >= 1 else None
+
+
+@app.route('/api/results/<result_id>/products', methods=['GET'])
+def get_result_products(result_id):
+    """저장된 결과의 제품 페이지 조회 (제품 번호 순서 고정)
+
+    - page / page_size: 페이지 번호 방식
+    - cursor: 이전 응답의 next_cursor (마지막으로 받은 제품 번호)
+      cursor 방식은 페이지 경계와 맞지 않을 수 있으므로 current_page / next_page 없음
+    """
+    result = result_store.load(result_id)
+    if result is None:
+        return jsonify({'error': '결과를 찾을 수 없습니다'}), 404
+    
+    page_size = _parse_positive_int(request.args.get('page_size'), PAGE_SIZE)
+    if page_size is None:
+        return jsonify({'error': 'page_size는 1 이상의 정수여야 합니다'}), 400
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    
+    products = result['products']
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        # 제품 번호(PROD_0031 → 31)는 저장된 순서와 같으므로 바로 위치 계산
+        try:
+            start = int(cursor.rsplit('_', 1)[-1])
+        except ValueError:
+            return jsonify({'error': '잘못된 cursor입니다'}), 400
+        if start < 0:
+            return jsonify({'error': '잘못된 cursor입니다'}), 400
+        page = None
+    else:
+        page = _parse_positive_int(request.args.get('page'), 1)
+        if page is None:
+            return jsonify({'error': 'page는 1 이상의 정수여야 합니다'}), 400
+        start = (page - 1) * page_size
+    
+    page_products = products[start:start + page_size]
+    end = start + len(page_products)
+    has_more = end < len(products)
+    
+    response = {
+        'result_id': result_id,
+        'products_count': len(products),
+        'total_pages': (len(products) + page_size - 1) // page_size,
+        'page_size': page_size,
+        'products': page_products,
+        'next_cursor': page_products[-1]['productNumber'] if has_more else None,
+    }
+    if page is not None:
+        response['current_page'] = page
+        response['next_page'] = page + 1 if has_more else None
+    
+    return jsonify(response)
+
+def _page_artifact_response(result_id, page, with_overlay):
+    """저장된 결과의 페이지 이미지 (처음 요청 시 생성 후 결과 디렉터리에 보관)"""
+    pages = result_store.load(result_id, ResultStore.PAGES_FILE)
+    source_path = result_store.file_path(result_id, ResultStore.SOURCE_FILE)
+    if pages is None or source_path is None:
+        return jsonify({'error': '결과를 찾을 수 없습니다'}), 404
+    
+    page_data = next((p for p in pages if p['page'] == page), None)
+    if page_data is None:
+        return jsonify({'error': '페이지를 찾을 수 없습니다'}), 404
+    
+    name = f"page-{page}-{'debug' if with_overlay else 'preview'}.img"
+    path = result_store.file_path(result_id, name)
+    if path is None:
+        encoded = get_extractor().render_page_image(
+            source_path, page - 1, page_data['overlay'] if with_overlay else None
+        )
+        result_store.save_bytes(result_id, name, encoded.data)
+        path = result_store.file_path(result_id, name)
+    
+    response = send_file(path, mimetype=ImageStore.guess_mimetype(path))
+    response.headers['Cache-Control'] = 'private, max-age=3600'
+    return response
+
+
+@app.route('/api/results/<result_id>/pages/<int:page>/debug', methods=['GET'])
+def get_page_debug_image(result_id, page):
+    """페이지 디버그 이미지 (이미지 박스 / 그리드 라인 표시)"""
+    return _page_artifact_response(result_id, page, with_overlay=True)
+
+
+@app.route('/api/results/<result_id>/pages/<int:page>/preview', methods=['GET'])
+def get_page_preview_image(result_id, page):
+    """페이지 미리보기 이미지"""
+    return _page_artifact_response(result_id, page, with_overlay=False)
+
+
+@app.route('/api/results/<result_id>/site/<name>', methods=['GET'])
+def download_result_site(result_id, name):
+    """저장된 결과의 독립 실행 HTML 다운로드 (저장소 이미지 → data URI)"""
+    if name not in SITE_FILES:
+        return jsonify({'error': '파일을 찾을 수 없습니다'}), 404
+    
+    result = result_store.load(result_id)
+    if result is None:
+        return jsonify({'error': '결과를 찾을 수 없습니다'}), 404
+    
+    generator = TemplateGenerator(result['company_name'], _inline_store_images(result['products']))
+    html = getattr(generator, SITE_FILES[name])()
+    
+    response = Response(html, mimetype='text/html')
+    response.headers['Content-Disposition'] = f'attachment; filename={name}'
+    return response
+
+
+@app.route('/img/<image_hash>', methods=['GET'])
+def get_image(image_hash):
+    """저장소 이미지 제공 (내용 주소 기반이라 영구 캐시 가능)"""
+    path = image_store.get_path(image_hash)
+    if path is None:
+        return jsonify({'error': '이미지를 찾을 수 없습니다'}), 404
+    
+    response = send_file(
+        path,
+        mimetype=ImageStore.guess_mimetype(path),
+        etag=image_hash,
+        conditional=True,
+        max_age=31536000
+    )
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    return response
+
+@app.before_request
+def _mark_first_request():
+    startup_report.mark_first_request()
+
+
 @app.route('/health', methods=['GET'])
 def health():
     logger.info("🏥 Health check 요청")
-    return jsonify({'status': 'ok', 'message': '백엔드 서버 정상 작동 중'})
+    return jsonify({
+        'status': 'ok',
+        'message': '백엔드 서버 정상 작동 중',
+        'ocr_cache': ocr_cache.stats(),
+        'result_cache': result_cache.stats(),
+        'startup': startup_report.summary()
+    })
 
 @app.route('/', methods=['GET'])
 def home():
@@ -138,10 +678,19 @@ def home():
         'version': '3.0 - Smart Grid',
         'endpoints': {
             '/health': 'Health check',
-            '/api/parse-pdf': 'PDF 파싱 (POST)'
+            '/api/parse-pdf': 'PDF 파싱 (POST, ?artifacts=1 → 페이지 미리보기 / 디버그 이미지 포함)',
+            '/api/parse-pdf/stream': '페이지별 스트리밍 파싱 (POST, NDJSON / SSE)',
+            '/api/jobs': 'PDF 파싱 작업 등록 (POST)',
+            '/api/jobs/<job_id>': '작업 상태 / 결과 조회 (GET)',
+            '/api/results/<result_id>/products': '제품 페이지 조회 (GET, page / page_size / cursor)',
+            '/api/results/<result_id>/pages/<n>/debug': '페이지 디버그 이미지 (GET, 요청 시 생성)',
+            '/api/results/<result_id>/pages/<n>/preview': '페이지 미리보기 이미지 (GET, 요청 시 생성)',
+            '/img/<hash>': '제품 이미지 (GET)'
         }
     })
 
+startup_report.record('import app', time.perf_counter() - PROCESS_START)
+
 if __name__ == '__main__':
     logger.info("🚀 Flask 서버 시작 (스마트 그리드 방식)...")
     logger.info("📍 서버 주소: http://localhost:5000")
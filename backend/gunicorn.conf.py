@@ -0,0 +1,28 @@
+"""
+gunicorn 설정 (작업 디렉터리의 gunicorn.conf.py를 자동으로 읽음)
+
+- GUNICORN_PRELOAD=1: 마스터에서 app + 무거운 모듈(fitz, PIL, numpy)을 한 번 import 후 fork
+  → 워커는 import가 끝난 상태로 시작, 재시작도 빠름 (메모리는 copy-on-write 공유)
+- WARM_UP=1: 워커가 요청을 받기 전에 추출기 / Vision 클라이언트까지 생성
+  (gRPC 채널은 fork 이후 워커마다 따로 만들어야 하므로 post_worker_init에서)
+- 둘 다 끄면 첫 요청 때 필요한 모듈만 import (기본값)
+"""
+
+import os
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '0') == '1'
+warm_up_workers = os.environ.get('WARM_UP', '0') == '1'
+
+
+def when_ready(server):
+    # preload면 여기는 마스터에서 fork 전에 실행됨
+    if preload_app:
+        import app
+        app.warm_up_imports()
+        app.startup_report.log(app.logger)
+
+
+def post_worker_init(worker):
+    if warm_up_workers:
+        import app
+        app.warm_up()
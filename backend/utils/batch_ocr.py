@@ -0,0 +1,215 @@
+"""
+Vision OCR 배치 처리
+- 여러 페이지 PNG를 batch_annotate_images 요청 하나로 묶음 (개수 / 바이트 상한)
+- 배치는 스레드 풀에서 동시에 전송, 동시 전송 배치 수 상한 (프로세스 공용)
+- 호출마다 deadline, 일시적 오류는 지수 백오프로 재시도
+→ OCR 시간은 페이지 수 합이 아니라 가장 느린 배치 수준
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.records import TextBlock
+
+_lock = threading.Lock()
+_batch_ocr_pid = None
+_batch_ocr = None
+
+
+def text_blocks_from_annotations(text_annotations):
+    """Vision text_annotations → 텍스트 블록 (첫 항목은 전체 텍스트라 제외)"""
+    text_blocks = []
+    for text in text_annotations[1:]:
+        vertices = text.bounding_poly.vertices
+        x = min(v.x for v in vertices)
+        y = min(v.y for v in vertices)
+        w = max(v.x for v in vertices) - x
+        h = max(v.y for v in vertices) - y
+
+        text_blocks.append(TextBlock.from_box(text.description, x, y, w, h))
+
+    return text_blocks
+
+
+class BatchOCR:
+    def __init__(self, client_getter, max_inflight=4):
+        # fork 이후에도 현재 프로세스의 클라이언트를 쓰도록 호출 시점에 가져옴
+        self.client_getter = client_getter
+        self.max_inflight = max_inflight
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_inflight, thread_name_prefix='ocr-batch'
+        )
+        self._slots = threading.BoundedSemaphore(max_inflight)
+
+    def session(self, batch_size=8, max_batch_bytes=8 * 1024 * 1024,
+                deadline_seconds=30, max_retries=3, backoff_seconds=0.5, max_wait_seconds=0.5):
+        """문서 하나의 OCR 배치 묶음"""
+        return OCRBatchSession(
+            self, batch_size, max_batch_bytes, deadline_seconds, max_retries, backoff_seconds,
+            max_wait_seconds
+        )
+
+    def submit(self, images, deadline_seconds, max_retries, backoff_seconds):
+        """배치 하나 전송 → Future[페이지별 텍스트 블록 리스트 (응답 오류인 페이지는 None)]
+
+        동시 전송 배치가 가득 차면 자리가 날 때까지 대기 (대기 중인 PNG 메모리 상한)
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(
+                self._annotate_batch, images, deadline_seconds, max_retries, backoff_seconds
+            )
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, _future):
+        self._slots.release()
+
+    def _annotate_batch(self, images, deadline_seconds, max_retries, backoff_seconds):
+        from google.api_core import exceptions
+        from google.cloud import vision
+
+        retryable = (
+            exceptions.DeadlineExceeded,
+            exceptions.ServiceUnavailable,
+            exceptions.ResourceExhausted,
+            exceptions.InternalServerError,
+        )
+
+        requests = [
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=image_bytes),
+                features=[vision.Feature(type_=vision.Feature.Type.TEXT_DETECTION)],
+            )
+            for image_bytes in images
+        ]
+
+        client = self.client_getter()
+        for attempt in range(max_retries + 1):
+            try:
+                # 재시도는 직접 처리 (클라이언트 기본 재시도 끔)
+                response = client.batch_annotate_images(
+                    requests=requests, timeout=deadline_seconds, retry=None
+                )
+                break
+            except retryable as e:
+                if attempt == max_retries:
+                    raise
+                delay = backoff_seconds * (2 ** attempt) * random.uniform(0.5, 1.0)
+                print(f"⚠️ OCR 배치 재시도 {attempt + 1}/{max_retries} ({delay:.1f}초 후): {e}")
+                time.sleep(delay)
+
+        page_blocks = []
+        for page_response in response.responses:
+            if page_response.error.message:
+                # 이미지별 오류는 "텍스트 없음"이 아니라 실패 (캐시하지 않도록 None)
+                print(f"❌ OCR 이미지 오류: {page_response.error.message}")
+                page_blocks.append(None)
+            else:
+                page_blocks.append(text_blocks_from_annotations(page_response.text_annotations))
+        return page_blocks
+
+
+class OCRBatchSession:
+    """이미지를 추가하면 배치가 차는 대로 전송, result() / results()로 수집
+
+    - 개수 / 바이트 상한에 닿거나 가장 오래된 이미지가 max_wait_seconds를 넘기면 전송
+    - 아직 전송 전인 이미지의 결과를 요청하면 그 배치를 바로 전송 (소비자가 기다리지 않도록)
+    - 추가(생산 스레드)와 결과 요청(소비 스레드)을 서로 다른 스레드에서 호출해도 됨
+    """
+
+    def __init__(self, batch_ocr, batch_size, max_batch_bytes, deadline_seconds,
+                 max_retries, backoff_seconds, max_wait_seconds=0.5):
+        self.batch_ocr = batch_ocr
+        self.batch_size = batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_wait_seconds = max_wait_seconds
+
+        self._lock = threading.Lock()
+        self._pending = []  # (key, png 바이트)
+        self._pending_bytes = 0
+        self._pending_since = None
+        self._submitted = {}  # key → (future, 배치 안 위치)
+
+    def add(self, key, image_bytes):
+        """이미지 PNG 추가 (배치가 차거나 오래되면 먼저 전송)"""
+        with self._lock:
+            if self._pending and (
+                len(self._pending) >= self.batch_size
+                or self._pending_bytes + len(image_bytes) > self.max_batch_bytes
+                or time.monotonic() - self._pending_since >= self.max_wait_seconds
+            ):
+                self._flush_locked()
+
+            if not self._pending:
+                self._pending_since = time.monotonic()
+            self._pending.append((key, image_bytes))
+            self._pending_bytes += len(image_bytes)
+
+    def flush(self):
+        """모아 둔 이미지를 배치 하나로 전송"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+
+        keys = [key for key, _ in self._pending]
+        images = [image_bytes for _, image_bytes in self._pending]
+        self._pending = []
+        self._pending_bytes = 0
+        self._pending_since = None
+
+        future = self.batch_ocr.submit(
+            images, self.deadline_seconds, self.max_retries, self.backoff_seconds
+        )
+        for index, key in enumerate(keys):
+            self._submitted[key] = (future, index)
+
+    def result(self, key):
+        """이미지 하나의 텍스트 블록 (실패한 배치 / 응답 오류면 None)"""
+        with self._lock:
+            if key not in self._submitted:
+                self._flush_locked()
+            future, index = self._submitted.pop(key)
+
+        try:
+            return future.result()[index]
+        except Exception as e:
+            print(f"❌ OCR 배치 오류: {e}")
+            return None
+
+    def results(self):
+        """전체 결과 {key: 텍스트 블록} (실패한 배치 / 응답 오류인 이미지는 None)"""
+        self.flush()
+
+        with self._lock:
+            keys = list(self._submitted)
+        return {key: self.result(key) for key in keys}
+
+
+def get_batch_ocr(client_getter, max_inflight=4):
+    """프로세스 공용 BatchOCR (fork 이후에는 새로 생성, 스레드 풀은 fork 불가)"""
+    global _batch_ocr_pid, _batch_ocr
+
+    pid = os.getpid()
+    if _batch_ocr_pid == pid:
+        return _batch_ocr
+
+    with _lock:
+        if _batch_ocr_pid != pid:
+            _batch_ocr = BatchOCR(client_getter, max_inflight=max_inflight)
+            _batch_ocr_pid = pid
+        return _batch_ocr
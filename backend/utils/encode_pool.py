@@ -0,0 +1,39 @@
+"""
+이미지 인코딩 스레드 풀 (프로세스 공용)
+- Pillow는 디코딩 / 리사이즈 / JPEG·WebP 인코딩 중 GIL을 놓음
+  → 페이지의 썸네일, 미리보기, 디버그 이미지를 스레드에서 동시에 인코딩
+- 모든 요청이 한 풀을 공유 → 동시 요청이 많아도 인코딩 스레드 수는 고정
+- 대기 작업 수 상한 (가득 차면 submit에서 대기)
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class EncodePool:
+    def __init__(self, max_workers=4, max_pending=64):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='encode'
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, func, *args):
+        """인코딩 작업 등록 → Future (대기 작업이 가득 차면 자리가 날 때까지 대기)"""
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(self._release_slot)
+        return future
+
+    def _release_slot(self, _future):
+        self._slots.release()
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
@@ -7,19 +7,42 @@
 """
 
 import io
+import copy
 import base64
 from PIL import Image, ImageDraw, ImageFont
 import fitz
-import os
 import re
 import json
-from collections import defaultdict
+import unicodedata
+from collections import defaultdict, deque
+from functools import partial
+from itertools import islice
 import hashlib
+import numpy as np
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from utils.page_raster import PageRaster
+from utils.spatial_index import TextBlockIndex
+from utils.xref_cache import XrefCache
+from utils.memory_guard import MemoryGuard
+from utils.mupdf_lock import MUPDF_LOCK
+from utils.vision_client import get_vision_client
+from utils.batch_ocr import get_batch_ocr
+from utils.pipeline import Pipeline
+from utils.records import ImageCandidate, PageLayout, PageWork, Product, TextBlock
+from utils.thumbnail import ThumbnailEncoder
 
 class ProductExtractor:
-    def __init__(self):
+    def __init__(self, init_vision=True, ocr_cache=None, image_store=None, encode_pool=None):
         self.use_vision = False
-        self._init_vision_api()
+        self.ocr_cache = ocr_cache
+        # 설정되면 제품 이미지를 base64 대신 /img/<hash> URL로 참조
+        self.image_store = image_store
+        # 설정되면 썸네일 / 미리보기 / 디버그 이미지를 공용 스레드 풀에서 인코딩
+        self.encode_pool = encode_pool
+        if init_vision:
+            self._init_vision_api()
         
         # 설정값 (나중에 UI로 조정 가능)
         self.config = {
@@ -31,125 +54,473 @@ class ProductExtractor:
             'horizontal_overlap_threshold': 0.3,
             'grid_clustering_threshold': 0.1,
             'max_texts_per_product': 8,
+            'parallel_workers': 1,  # 1 = 단일 프로세스
+            'parallel_start_method': 'spawn',
+            'parallel_chunk_pages': 8,  # 워커가 한 번에 처리해서 돌려주는 최대 페이지 수
+            'text_source': 'auto',  # auto(내장 텍스트 우선) | native | vision
+            'native_text_min_words': 3,
+            'native_text_max_garbled_ratio': 0.1,
+            'xref_cache_max_mb': 64,  # 문서 단위 xref 캐시 상한
+            'max_rss_mb': 0,  # 프로세스 RSS 상한 (0 = 제한 없음), 페이지마다 확인
+            'page_artifacts': True,  # False면 페이지 미리보기 / 디버그 이미지 생략 (렌더링도 안 함)
+            'thumbnail_width': 400,
+            'thumbnail_format': 'jpeg',  # jpeg | webp
+            'thumbnail_quality': 90,
+            'thumbnail_optimize': False,  # True면 JPEG 허프만 최적화 (인코딩 시간 약 2배)
+            'thumbnail_passthrough_kb': 30,  # 이보다 작고 좁은 JPEG는 원본 그대로 (0 = 끔)
+            'thumbnail_passthrough_max_bpp': 0.3,  # 픽셀당 바이트가 이보다 큰 원본은 재인코딩 (q90 JPEG 수준)
+            'thumbnail_srcset_widths': [],  # 예: [200, 800] → srcset 변형 (이미지 저장소 사용 시)
+            'ocr_batch_size': 8,  # batch_annotate_images 한 번에 보내는 최대 페이지 수
+            'ocr_batch_max_mb': 8,  # 배치 하나의 PNG 합계 상한
+            'ocr_max_inflight': 4,  # 동시에 전송 중인 배치 수 상한 (프로세스 공용, 처음 설정값 사용)
+            'ocr_deadline_seconds': 30,  # Vision 호출 하나의 deadline
+            'ocr_max_retries': 3,  # 일시적 오류(deadline, 503, 429) 재시도 횟수
+            'ocr_backoff_seconds': 0.5,  # 재시도 대기 시작값 (지수 증가 + 지터)
+            'ocr_batch_max_wait_seconds': 0.5,  # 배치가 덜 차도 가장 오래된 페이지가 이만큼 기다리면 전송
+            'ocr_regions': False,  # True면 제품 이미지 주변(text_search_radius_*)만 잘라서 OCR
+            'ocr_region_max_coverage': 0.6,  # 영역 합이 페이지의 이 비율을 넘으면 전체 페이지 OCR
+            'pipeline_queue_size': 2,  # 단계 사이 대기 페이지 수 (0 = 파이프라인 끔, 페이지별 순차 처리)
         }
     
     def _init_vision_api(self):
-        """Google Vision API 초기화"""
-        try:
-            from google.cloud import vision
-            
-            credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-            if credentials_json:
-                credentials_path = '/tmp/google-credentials.json'
-                with open(credentials_path, 'w') as f:
-                    f.write(credentials_json)
-                os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = credentials_path
-            elif os.path.exists('google-vision-key.json'):
-                os.environ['GOOGLE_APPLICATION_CREDENTIALS'] = 'google-vision-key.json'
-            else:
-                raise Exception("No credentials found")
-            
-            self.vision_client = vision.ImageAnnotatorClient()
-            self.use_vision = True
-            print("✅ Google Vision API 활성화\n")
-            
-        except Exception as e:
-            print(f"⚠️ Vision API 비활성화: {e}")
-            print("   → 제품명 추출이 제한될 수 있습니다\n")
-            self.use_vision = False
+        """Google Vision API 초기화 (프로세스 공용 클라이언트, 실패도 캐시)"""
+        self.use_vision = get_vision_client() is not None
+    
+    @property
+    def vision_client(self):
+        """현재 프로세스의 공용 Vision 클라이언트 (fork 이후에는 자동으로 새로 생성)"""
+        return get_vision_client() if self.use_vision else None
     
-    def extract_from_pdf(self, pdf_bytes):
-        """메인 추출 함수"""
-        results = []
+    def with_config(self, **overrides):
+        """설정만 바꾼 추출기 (Vision 클라이언트 / 캐시 / 풀 공유, 요청별 설정용)
+
+        추출 메서드는 호출마다 상태를 지역 변수로 가지므로 공유 인스턴스를
+        여러 스레드에서 동시에 사용해도 됨 (config만 요청별로 분리)
+        """
+        clone = copy.copy(self)
+        clone.config = {**self.config, **overrides}
+        return clone
+    
+    def extract_from_pdf(self, pdf_source, progress_callback=None):
+        """메인 추출 함수 (전체 페이지 결과 리스트)
+
+        pdf_source: PDF 파일 경로 (권장, MuPDF가 필요한 부분만 읽음) 또는 바이트
+        progress_callback(done, total): 페이지 하나가 끝날 때마다 호출
+        """
+        return list(self.iter_pages(pdf_source, progress_callback))
+    
+    def iter_pages(self, pdf_source, progress_callback=None):
+        """페이지 결과를 하나씩 생성하는 제너레이터 (페이지 순서 유지)
+
+        스트리밍 모드: 완료된 페이지를 순서대로 전달 (보관하지 않음)
+        단일 프로세스면 단계별 파이프라인 (단계 사이 큐 크기 = pipeline_queue_size → 처리 중인 페이지 수 상한)
+        max_rss_mb가 설정되면 페이지마다 RSS 확인, 정리 후에도 넘으면 MemoryCeilingExceeded
+        """
+        pdf_document = None
+        pages = None
+        pipeline = None
         
         try:
-            pdf_document = fitz.open(stream=pdf_bytes, filetype="pdf")
-            total_pages = len(pdf_document)
+            with MUPDF_LOCK:
+                pdf_document = _open_pdf(pdf_source)
+                total_pages = len(pdf_document)
             
             print(f"\n{'='*80}")
             print(f"📄 PDF 분석: {total_pages}페이지")
             print(f"{'='*80}\n")
             
-            # OCR 실행
-            all_pages_text_data = {}
-            if self.use_vision:
-                print("🔍 OCR 실행 중...\n")
-                all_pages_text_data = self._extract_all_text_once(pdf_document)
+            if progress_callback:
+                progress_callback(0, total_pages)
             
-            for page_num in range(total_pages):
-                print(f"\n{'='*80}")
-                print(f"📖 페이지 {page_num + 1}/{total_pages}")
-                print(f"{'='*80}\n")
-                
-                page = pdf_document[page_num]
-                
-                # 페이지 렌더링
-                zoom = 2.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-                page_img_bytes = pix.tobytes("png")
-                page_width = pix.width
-                page_height = pix.height
-                
-                text_blocks = all_pages_text_data.get(page_num, [])
+            workers = min(self.config['parallel_workers'], total_pages)
+            
+            # 페이지 사이에 반복되는 이미지는 문서에서 한 번만 처리
+            xref_cache = self._new_xref_cache()
+            memory_guard = self._new_memory_guard(xref_cache)
+            
+            if workers > 1:
+                # 워커 프로세스는 Vision 클라이언트가 없으므로 텍스트 선처리
+                print("🔍 텍스트 추출 중...\n")
+                all_pages_text_data = self._extract_all_text_once(pdf_document)
                 
-                # 이미지 및 레이아웃 분석
-                layout = self._analyze_page_layout(
-                    page, pdf_document, text_blocks, 
-                    page_width, page_height
+                pages = self._iter_pages_parallel(
+                    pdf_source, total_pages, all_pages_text_data, workers
                 )
+            elif self.config['pipeline_queue_size'] > 0:
+                pipeline, pages = self._iter_pages_pipelined(
+                    pdf_document, total_pages, xref_cache
+                )
+            else:
+                pages = (
+                    self._process_page(pdf_document, page_num, total_pages,
+                                       xref_cache=xref_cache)
+                    for page_num in range(total_pages)
+                )
+            
+            for done, page_result in enumerate(pages, start=1):
+                if progress_callback:
+                    progress_callback(done, total_pages)
+                yield page_result
                 
-                # 제품 추출
-                products = self._extract_products_from_layout(layout)
-                
-                # 결과 저장
-                page_pil = Image.open(io.BytesIO(page_img_bytes))
-                
-                results.append({
-                    'page': page_num + 1,
-                    'type': layout['type'],
-                    'image': self._image_to_base64(page_pil),
-                    'debug_image': self._create_debug_image(page_img_bytes, layout, products),
-                    'products': products,
-                    'layout_info': {
-                        'type': layout['type'],
-                        'grid': f"{layout['grid_cols']}x{layout['grid_rows']}",
-                        'images': len(layout['images']),
-                        'avg_confidence': sum(p.get('confidence', 0) for p in products) / len(products) if products else 0
-                    }
-                })
-                
-                print(f"\n✅ 완료: {len(products)}개 제품 추출")
-                print(f"   평균 신뢰도: {results[-1]['layout_info']['avg_confidence']:.1%}\n")
+                # 소비자가 결과를 넘겨받은 뒤 확인 (다음 페이지 처리 전)
+                del page_result
+                memory_guard.check()
             
-            pdf_document.close()
-            return results
+            if pipeline is not None:
+                pipeline.log()
             
         except Exception as e:
             print(f"\n❌ 오류: {str(e)}\n")
             import traceback
             traceback.print_exc()
             raise
+        
+        finally:
+            # 단계 스레드 / 워커를 먼저 멈춘 뒤 문서 닫기 (소비자가 중간에 멈춘 경우)
+            if pages is not None:
+                pages.close()
+            if pdf_document is not None:
+                with MUPDF_LOCK:
+                    pdf_document.close()
+    
+    def _iter_pages_parallel(self, pdf_source, total_pages, all_pages_text_data, workers):
+        """페이지 범위를 프로세스 풀에 나눠서 처리 (페이지 순서 유지)
+
+        pdf_source가 경로면 워커마다 같은 파일을 직접 염 (바이트 복사 없음)
+        """
+        
+        # 워커당 4개 정도의 연속 구간으로 나눠 부하 분산 (구간 크기 상한 → 메모리 고정)
+        chunk_size = max(1, min(-(-total_pages // (workers * 4)),
+                                self.config['parallel_chunk_pages']))
+        chunks = [
+            [(page_num, all_pages_text_data.get(page_num, []))
+             for page_num in range(start, min(start + chunk_size, total_pages))]
+            for start in range(0, total_pages, chunk_size)
+        ]
+        
+        print(f"⚙️  병렬 처리: 프로세스 {workers}개, 구간 {len(chunks)}개\n")
+        
+        context = multiprocessing.get_context(self.config['parallel_start_method'])
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_page_worker,
+            initargs=(pdf_source, self.config, self.image_store),
+        ) as executor:
+            # executor.map은 모든 구간을 한꺼번에 제출 → 소비가 느리면 결과가 쌓임
+            # 워커당 2개 구간까지만 미리 처리
+            chunk_iter = iter(chunks)
+            pending = deque(
+                executor.submit(_process_page_chunk, chunk)
+                for chunk in islice(chunk_iter, workers * 2)
+            )
+            
+            while pending:
+                chunk_results = pending.popleft().result()
+                chunk = next(chunk_iter, None)
+                if chunk is not None:
+                    pending.append(executor.submit(_process_page_chunk, chunk))
+                yield from chunk_results
+    
+    def _new_memory_guard(self, xref_cache=None):
+        """RSS 상한 확인기 (넘으면 xref 캐시 / MuPDF 캐시 비우고 재확인)"""
+        release_callbacks = [xref_cache.clear] if xref_cache is not None else []
+        return MemoryGuard(self.config['max_rss_mb'] * 1024 * 1024, release_callbacks)
+    
+    def _new_xref_cache(self):
+        """문서 단위 xref 캐시 생성"""
+        return XrefCache(max_bytes=self.config['xref_cache_max_mb'] * 1024 * 1024)
+    
+    def _process_page(self, pdf_document, page_num, total_pages, text_blocks=None,
+                      xref_cache=None):
+        """페이지 하나 처리 → 페이지 결과 (파이프라인 단계를 차례로 실행)
+
+        text_blocks가 None이면 페이지에서 직접 텍스트 확보 (OCR은 이 페이지만 배치 하나로)
+        """
+        session = self._new_ocr_session()
+        work = PageWork(page_num, text_blocks=text_blocks)
+        work = self._stage_render(pdf_document, total_pages, xref_cache, session, work)
+        work = self._stage_text(session, work)
+        work = self._stage_inventory(pdf_document, xref_cache, work)
+        work = self._stage_match(xref_cache, work)
+        return self._stage_encode(work)
+    
+    def _iter_pages_pipelined(self, pdf_document, total_pages, xref_cache):
+        """단계별 스레드로 페이지 처리 (페이지 순서 유지) → (파이프라인, 결과 제너레이터)
+
+        render → text → inventory → match → encode → emit
+        - OCR(네트워크)을 기다리는 동안 앞 / 뒤 페이지의 렌더링, 매칭, 인코딩 진행
+        - fitz는 스레드 안전하지 않으므로 fitz를 쓰는 단계(render, inventory)는 MUPDF_LOCK
+          (프로세스 공용: 동시에 처리 중인 다른 문서 / 요청 스레드와도 겹치지 않음)
+        - OCR은 문서 하나의 배치 세션으로 묶어 전송, render는 text보다
+          배치 크기 × 동시 전송 배치 수만큼 앞서 갈 수 있음 (pipeline_queue_size와 별개)
+        """
+        session = self._new_ocr_session()
+        ocr_lookahead = self.config['ocr_batch_size'] * self.config['ocr_max_inflight']
+        queue_size = self.config['pipeline_queue_size']
+        
+        pipeline = Pipeline([
+            ('render', partial(self._stage_render, pdf_document, total_pages, xref_cache,
+                               session),
+             max(queue_size, ocr_lookahead)),
+            ('text', partial(self._stage_text, session)),
+            ('inventory', partial(self._stage_inventory, pdf_document, xref_cache)),
+            ('match', partial(self._stage_match, xref_cache)),
+            ('encode', self._stage_encode),
+        ], queue_size=queue_size)
+        
+        return pipeline, pipeline.run(PageWork(page_num) for page_num in range(total_pages))
+    
+    def _stage_render(self, pdf_document, total_pages, xref_cache, session, work):
+        """render: 내장 텍스트 확보 또는 OCR용 렌더링 → OCR 배치 세션에 추가 (결과는 기다리지 않음)
+
+        OCR 래스터는 여기서 바로 해제 (앞서 간 페이지들이 래스터를 붙잡고 있지 않도록)
+        page_artifacts면 DisplayList만 work.raster로 넘겨 inventory 단계의 미리보기에 재사용
+        """
+        page_num = work.page_num
+        ocr_images = None
+        
+        with MUPDF_LOCK:
+            print(f"\n{'='*80}")
+            print(f"📖 페이지 {page_num + 1}/{total_pages}")
+            print(f"{'='*80}\n")
+            
+            page = pdf_document[page_num]
+            
+            if work.text_blocks is None:
+                # OCR을 못 하거나 생략 / 실패하면 내장 텍스트를 그대로 사용
+                work.text_blocks, needs_ocr = self._native_text(page, page_num)
+                
+                if needs_ocr:
+                    raster = PageRaster(page, consumers=('ocr',) + self._preview_consumers())
+                    try:
+                        ocr_images, work.ocr_origins = self._render_ocr_images(
+                            pdf_document, page, xref_cache, raster, work
+                        )
+                        raster.release('ocr')
+                    except BaseException:
+                        raster.close()
+                        raise
+                    if self.config['page_artifacts']:
+                        work.raster = raster
+                    else:
+                        raster.close()
+            
+            # 페이지 / 래스터 객체 해제(MuPDF 호출)도 잠금 안에서
+            page = raster = None
+        
+        if ocr_images:
+            cached, work.ocr_cache_key = self._ocr_cache_lookup(
+                b''.join(ocr_images), page_num, work.ocr_origins
+            )
+            if cached is not None:
+                work.text_blocks = cached
+            else:
+                work.ocr_keys = [(page_num, i) for i in range(len(ocr_images))]
+                for key, img_bytes in zip(work.ocr_keys, ocr_images):
+                    session.add(key, img_bytes)
+        
+        return work
     
-    def _analyze_page_layout(self, page, pdf_document, text_blocks, page_width, page_height):
-        """페이지 레이아웃 분석"""
+    def _render_ocr_images(self, pdf_document, page, xref_cache, raster, work):
+        """OCR로 보낼 PNG 목록 + 이미지별 픽셀 원점
+
+        - 기본: 전체 페이지 한 장
+        - ocr_regions: 제품 이미지 후보 주변 영역만 (후보가 없으면 OCR 생략)
+          이미지 수집을 여기서 먼저 하므로 inventory 단계는 결과를 재사용
+        """
+        if self.config['ocr_regions']:
+            work.images = self._inventory_images(page, pdf_document, xref_cache)
+            regions = self._ocr_regions(work.images, raster.layout_width, raster.layout_height)
+            
+            if regions is not None:
+                crops = [raster.ocr_region_png(region) for region in regions]
+                print(f"   페이지 {work.page_num + 1}: OCR 영역 {len(crops)}개")
+                return [png for png, _ in crops], [origin for _, origin in crops]
         
-        # 1. 이미지 수집 및 필터링
-        raw_images = self._collect_images(page, pdf_document)
+        return [raster.ocr_png()], [(0, 0)]
+    
+    def _ocr_regions(self, images, page_width, page_height):
+        """제품 이미지를 텍스트 탐색 반경만큼 넓힌 영역 (겹치면 합침, 레이아웃 좌표)
+
+        영역 합이 페이지 대부분이면 None (전체 페이지 한 장이 더 저렴)
+        """
+        dx = self.config['text_search_radius_horizontal']
+        dy = self.config['text_search_radius_vertical']
+        
+        # 페이지 사각형과 교차 (페이지 밖 재단 영역의 후보는 빈 영역 → 제외)
+        regions = []
+        for img in images:
+            x0 = max(0, img.x - dx)
+            y0 = max(0, img.y - dy)
+            x1 = min(page_width, img.x + img.w + dx)
+            y1 = min(page_height, img.y + img.h + dy)
+            if x1 > x0 and y1 > y0:
+                regions.append([x0, y0, x1, y1])
+        
+        # 겹치는 영역이 없어질 때까지 합침 (같은 글자를 두 번 OCR하지 않도록)
+        merged = True
+        while merged:
+            merged = False
+            for i in range(len(regions)):
+                for j in range(i + 1, len(regions)):
+                    a, b = regions[i], regions[j]
+                    if a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]:
+                        regions[i] = [min(a[0], b[0]), min(a[1], b[1]),
+                                      max(a[2], b[2]), max(a[3], b[3])]
+                        del regions[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+        
+        covered = sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in regions)
+        if covered > page_width * page_height * self.config['ocr_region_max_coverage']:
+            return None
+        
+        # 위 → 아래, 왼쪽 → 오른쪽 (텍스트 블록 순서 = 영역 순서)
+        return [tuple(region) for region in sorted(regions, key=lambda r: (r[1], r[0]))]
+    
+    def _stage_text(self, session, work):
+        """text: OCR 결과 대기 (OCR 캐시 저장, 아직 전송 전인 배치는 바로 전송)
+
+        OCR이 실패하면 render 단계에서 넣어 둔 내장 텍스트 유지
+        """
+        if work.ocr_keys is None:
+            return work
+        
+        try:
+            image_blocks = [session.result(key) for key in work.ocr_keys]
+            if any(blocks is None for blocks in image_blocks):
+                # Vision 응답 오류 → 캐시하지 않음 (다음 요청에서 다시 OCR)
+                print(f"   페이지 {work.page_num + 1}: OCR 실패 → 내장 텍스트 {len(work.text_blocks)}개 사용")
+            else:
+                work.text_blocks = self._blocks_to_page(image_blocks, work.ocr_origins)
+                self._ocr_cache_store(work.ocr_cache_key, work.text_blocks)
+                print(f"   페이지 {work.page_num + 1}: {len(work.text_blocks)}개 텍스트 추출")
+        except Exception as e:
+            print(f"❌ OCR 오류: {e} → 내장 텍스트 {len(work.text_blocks)}개 사용")
+        work.ocr_keys = None
+        
+        return work
+    
+    def _blocks_to_page(self, image_blocks, origins):
+        """OCR 이미지별 텍스트 블록 → 페이지 좌표 텍스트 블록 하나의 리스트"""
+        if origins == [(0, 0)]:
+            return image_blocks[0]
+        
+        return [
+            TextBlock.from_box(block.text, block.x + ox, block.y + oy, block.w, block.h)
+            for blocks, (ox, oy) in zip(image_blocks, origins)
+            for block in blocks
+        ]
+    
+    def _stage_inventory(self, pdf_document, xref_cache, work):
+        """inventory: 페이지 이미지 수집 / 필터링 + 미리보기 렌더링 (fitz 작업 전부)
+
+        render 단계에서 넘겨받은 래스터가 있으면 그 DisplayList로 미리보기 렌더링
+        """
+        with MUPDF_LOCK:
+            page = pdf_document[work.page_num]
+            raster = work.raster or PageRaster(page, consumers=self._preview_consumers())
+            work.raster = None
+            
+            with raster:
+                # 레이아웃 좌표계는 2배 렌더링 기준 (렌더링 없이 크기만 계산)
+                work.page_width = raster.layout_width
+                work.page_height = raster.layout_height
+                
+                if work.images is None:
+                    work.images = self._inventory_images(page, pdf_document, xref_cache)
+                
+                if self.config['page_artifacts']:
+                    work.preview = raster.preview_image()
+                    work.preview_scale = raster.preview_scale
+            
+            page = raster = None
+        
+        return work
+    
+    def _preview_consumers(self):
+        """미리보기 래스터 소비자 (page_artifacts가 꺼져 있으면 없음)"""
+        return ('preview', 'debug') if self.config['page_artifacts'] else ()
+    
+    def _stage_match(self, xref_cache, work):
+        """match: 레이아웃 분석 + 제품 매칭 (썸네일 / 미리보기 / 디버그 인코딩은 스레드 풀에 등록만)"""
+        work.layout = self._layout_from_images(
+            work.images, work.text_blocks, work.page_width, work.page_height, xref_cache
+        )
+        work.overlay = self._layout_overlay(work.layout)
+        
+        if work.preview is not None:
+            work.page_image_future = self._submit_encode(self._image_to_base64, work.preview)
+        
+        work.products = self._extract_products_from_layout(work.layout)
+        
+        if work.preview is not None:
+            work.debug_image_future = self._submit_encode(
+                self._create_debug_image, work.preview, work.preview_scale, work.overlay
+            )
+            work.preview = None
+        
+        return work
+    
+    def _stage_encode(self, work):
+        """encode: 인코딩 완료 대기 → 페이지 결과"""
+        layout = work.layout
+        products = work.products
+        
+        # 결과 저장 (인코딩 완료 대기)
+        self._resolve_product_images(products)
+        page_image = work.page_image_future.result() if work.page_image_future else None
+        debug_image = work.debug_image_future.result() if work.debug_image_future else None
+        
+        # API 경계: 레코드 → dict
+        result = {
+            'page': work.page_num + 1,
+            'type': layout.type,
+            'image': page_image,
+            'debug_image': debug_image,
+            'products': [p.to_dict() for p in products],
+            'overlay': work.overlay,
+            'layout_info': {
+                'type': layout.type,
+                'grid': f"{layout.grid_cols}x{layout.grid_rows}",
+                'images': len(layout.images),
+                'avg_confidence': sum(p.confidence for p in products) / len(products) if products else 0
+            }
+        }
+        
+        print(f"\n✅ 완료: {len(products)}개 제품 추출")
+        print(f"   평균 신뢰도: {result['layout_info']['avg_confidence']:.1%}\n")
+        
+        return result
+    
+    def _inventory_images(self, page, pdf_document, xref_cache=None):
+        """페이지 이미지 수집 및 필터링 → 제품 이미지 후보"""
+        raw_images = self._collect_images(page, pdf_document, xref_cache)
         filtered_images = self._filter_product_images(raw_images)
         
         print(f"🖼️  이미지: {len(raw_images)}개 발견 → {len(filtered_images)}개 필터링")
         
+        return filtered_images
+    
+    def _layout_from_images(self, filtered_images, text_blocks, page_width, page_height,
+                            xref_cache=None):
+        """제품 이미지 후보 + 텍스트 → 페이지 레이아웃"""
         if not filtered_images:
-            return {
-                'type': 'no_products',
-                'grid_cols': 0,
-                'grid_rows': 0,
-                'images': [],
-                'text_blocks': text_blocks,
-                'page_width': page_width,
-                'page_height': page_height
-            }
+            return PageLayout(
+                type='no_products',
+                grid_cols=0,
+                grid_rows=0,
+                images=[],
+                text_blocks=text_blocks,
+                text_index=None,
+                xref_cache=xref_cache,
+                page_width=page_width,
+                page_height=page_height
+            )
         
         # 2. 그리드 패턴 감지
         grid_info = self._detect_grid(filtered_images, page_width, page_height)
@@ -161,104 +532,142 @@ class ProductExtractor:
         
         print(f"🎯 타입: {layout_type}")
         
-        return {
-            'type': layout_type,
-            'grid_cols': grid_info['cols'],
-            'grid_rows': grid_info['rows'],
-            'images': filtered_images,
-            'text_blocks': text_blocks,
-            'page_width': page_width,
-            'page_height': page_height,
-            'grid_info': grid_info
-        }
+        # 4. 텍스트 좌표 배열 (매칭 전략들이 공유)
+        text_index = TextBlockIndex(text_blocks)
+        
+        return PageLayout(
+            type=layout_type,
+            grid_cols=grid_info['cols'],
+            grid_rows=grid_info['rows'],
+            images=filtered_images,
+            text_blocks=text_blocks,
+            text_index=text_index,
+            xref_cache=xref_cache,
+            page_width=page_width,
+            page_height=page_height,
+            grid_info=grid_info
+        )
     
-    def _collect_images(self, page, pdf_document):
-        """페이지에서 모든 이미지 수집"""
+    def _collect_images(self, page, pdf_document, xref_cache=None):
+        """페이지에서 이미지 수집 (메타데이터 크기 필터 통과분만 추출)
+
+        xref_cache가 있으면 앞 페이지에서 추출한 xref는 다시 추출 / 해시하지 않음
+        """
         images = []
         image_list = page.get_images(full=True)
+        placements = self._build_image_inventory(page)
+        seen_xrefs = set()
+        zoom = 2.0
         
         for img_index, img in enumerate(image_list):
             try:
                 xref = img[0]
-                rects = page.get_image_rects(xref)
-                if not rects:
+                
+                # 같은 xref가 목록에 여러 번 나와도 배치는 인벤토리에서 한 번에 처리
+                if xref in seen_xrefs:
+                    continue
+                seen_xrefs.add(xref)
+                
+                # 추출 / 디코딩 전에 PDF 메타데이터 크기로 먼저 탈락시킴 (아이콘, 로고 등)
+                if not self._passes_size_filter(img[2], img[3]):
                     continue
                 
-                rect = rects[0]
-                zoom = 2.0
+                xref_placements = placements.get(xref)
+                if not xref_placements:
+                    continue
                 
-                base_image = pdf_document.extract_image(xref)
-                image_bytes = base_image["image"]
-                pil_image = Image.open(io.BytesIO(image_bytes))
-                actual_width, actual_height = pil_image.size
+                cached = xref_cache.get(xref) if xref_cache is not None else None
+                if cached is not None:
+                    image_bytes = cached['image_bytes']
+                    actual_width = cached['actual_width']
+                    actual_height = cached['actual_height']
+                    image_hash = cached['hash']
+                else:
+                    base_image = pdf_document.extract_image(xref)
+                    image_bytes = base_image["image"]
+                    # 헤더만 읽어 크기 확인 (실제 디코딩은 썸네일 인코딩 시점)
+                    actual_width, actual_height = Image.open(io.BytesIO(image_bytes)).size
+                    image_hash = hashlib.md5(image_bytes).hexdigest()
+                    
+                    if xref_cache is not None:
+                        xref_cache.put(xref, image_bytes, actual_width, actual_height, image_hash)
                 
-                images.append({
-                    'xref': xref,
-                    'index': img_index,
-                    'x': rect.x0 * zoom,
-                    'y': rect.y0 * zoom,
-                    'w': (rect.x1 - rect.x0) * zoom,
-                    'h': (rect.y1 - rect.y0) * zoom,
-                    'actual_width': actual_width,
-                    'actual_height': actual_height,
-                    'area': actual_width * actual_height,
-                    'aspect_ratio': actual_width / actual_height if actual_height > 0 else 0,
-                    'image_bytes': image_bytes,
-                    'pil_image': pil_image,
-                    'hash': hashlib.md5(image_bytes).hexdigest()
-                })
+                # 같은 xref가 여러 번 배치되면 배치마다 후보 생성
+                for placement, (rect, transform) in enumerate(xref_placements):
+                    images.append(ImageCandidate(
+                        xref=xref,
+                        index=img_index,
+                        placement=placement,
+                        x=rect.x0 * zoom,
+                        y=rect.y0 * zoom,
+                        w=(rect.x1 - rect.x0) * zoom,
+                        h=(rect.y1 - rect.y0) * zoom,
+                        transform=transform,
+                        actual_width=actual_width,
+                        actual_height=actual_height,
+                        area=actual_width * actual_height,
+                        aspect_ratio=actual_width / actual_height if actual_height > 0 else 0,
+                        image_bytes=image_bytes,
+                        hash=image_hash
+                    ))
                 
             except Exception as e:
                 continue
         
         return images
     
-    def _filter_product_images(self, images):
-        """제품 이미지 필터링 (중복 제거 + 크기 필터)"""
-        
-        # 1. 크기 필터링
-        size_filtered = []
-        for img in images:
-            w, h = img['actual_width'], img['actual_height']
-            area = img['area']
-            aspect = img['aspect_ratio']
-            
-            # 크기 체크
-            if w < self.config['min_image_size'] or h < self.config['min_image_size']:
-                continue
-            if w > self.config['max_image_size'] or h > self.config['max_image_size']:
-                continue
-            if area < self.config['min_image_area']:
-                continue
+    def _build_image_inventory(self, page):
+        """페이지 이미지 배치를 한 번에 수집 → {xref: [(bbox, transform), ...]}
+
+        xref마다 get_image_rects를 부르면 매번 페이지 전체를 다시 훑으므로
+        get_image_info 한 번으로 모든 배치를 모은다 (표시 순서 유지)
+        """
+        placements = defaultdict(list)
+        
+        for info in page.get_image_info(xrefs=True):
+            xref = info.get('xref', 0)
+            if xref <= 0:
+                continue  # 인라인 이미지는 추출 불가
             
-            # 비율 체크 (너무 길쭉하면 제외)
-            if not (0.3 <= aspect <= 3.0):
+            rect = fitz.Rect(info['bbox'])
+            if rect.is_empty or rect.is_infinite:
                 continue
             
-            size_filtered.append(img)
+            placements[xref].append((rect, fitz.Matrix(info['transform'])))
+        
+        return placements
+    
+    def _filter_product_images(self, images):
+        """제품 이미지 필터링 (중복 제거 + 크기 필터)"""
+        
+        # 1. 크기 필터링 (실제 디코딩 크기 기준 재확인)
+        size_filtered = [
+            img for img in images
+            if self._passes_size_filter(img.actual_width, img.actual_height)
+        ]
         
         # 2. 중복 제거 (해시 기반)
         seen_hashes = set()
         hash_filtered = []
         
         for img in size_filtered:
-            if img['hash'] not in seen_hashes:
-                seen_hashes.add(img['hash'])
+            if img.hash not in seen_hashes:
+                seen_hashes.add(img.hash)
                 hash_filtered.append(img)
         
         # 3. 위치 중복 제거 (비슷한 위치의 작은 이미지)
-        hash_filtered.sort(key=lambda x: x['area'], reverse=True)
+        hash_filtered.sort(key=lambda x: x.area, reverse=True)
         
         position_filtered = []
         for img in hash_filtered:
             is_duplicate = False
             
             for existing in position_filtered:
-                x_diff = abs(img['x'] - existing['x'])
-                y_diff = abs(img['y'] - existing['y'])
+                x_diff = abs(img.x - existing.x)
+                y_diff = abs(img.y - existing.y)
                 
                 # 50px 이내 + 더 작으면 중복으로 간주
-                if x_diff < 50 and y_diff < 50 and img['area'] < existing['area']:
+                if x_diff < 50 and y_diff < 50 and img.area < existing.area:
                     is_duplicate = True
                     break
             
@@ -267,11 +676,26 @@ class ProductExtractor:
         
         # 중심점 계산
         for img in position_filtered:
-            img['center_x'] = img['x'] + img['w'] / 2
-            img['center_y'] = img['y'] + img['h'] / 2
+            img.center_x = img.x + img.w / 2
+            img.center_y = img.y + img.h / 2
         
         return position_filtered
     
+    def _passes_size_filter(self, w, h):
+        """크기 / 면적 / 비율 필터"""
+        
+        # 크기 체크
+        if w < self.config['min_image_size'] or h < self.config['min_image_size']:
+            return False
+        if w > self.config['max_image_size'] or h > self.config['max_image_size']:
+            return False
+        if w * h < self.config['min_image_area']:
+            return False
+        
+        # 비율 체크 (너무 길쭉하면 제외)
+        aspect = w / h if h > 0 else 0
+        return 0.3 <= aspect <= 3.0
+    
     def _detect_grid(self, images, page_width, page_height):
         """그리드 패턴 감지 (개선된 클러스터링)"""
         
@@ -284,12 +708,12 @@ class ProductExtractor:
             }
         
         # X좌표 클러스터링
-        x_coords = sorted([img['center_x'] for img in images])
+        x_coords = sorted([img.center_x for img in images])
         x_threshold = page_width * self.config['grid_clustering_threshold']
         x_clusters = self._cluster_coordinates(x_coords, x_threshold)
         
         # Y좌표 클러스터링
-        y_coords = sorted([img['center_y'] for img in images])
+        y_coords = sorted([img.center_y for img in images])
         y_threshold = page_height * self.config['grid_clustering_threshold']
         y_clusters = self._cluster_coordinates(y_coords, y_threshold)
         
@@ -297,8 +721,8 @@ class ProductExtractor:
         rows = len(y_clusters)
         
         # 평균 간격 계산
-        avg_img_w = sum(img['w'] for img in images) / len(images)
-        avg_img_h = sum(img['h'] for img in images) / len(images)
+        avg_img_w = sum(img.w for img in images) / len(images)
+        avg_img_h = sum(img.h for img in images) / len(images)
         
         return {
             'cols': cols,
@@ -352,7 +776,7 @@ class ProductExtractor:
     def _extract_products_from_layout(self, layout):
         """레이아웃에서 제품 추출"""
         
-        layout_type = layout['type']
+        layout_type = layout.type
         
         if layout_type == 'no_products':
             return []
@@ -377,16 +801,17 @@ class ProductExtractor:
         """셀 기반 매칭 (그리드 레이아웃용)"""
         
         products = []
-        images = layout['images']
-        text_blocks = layout['text_blocks']
-        grid_info = layout['grid_info']
+        images = layout.images
+        text_blocks = layout.text_blocks
+        text_index = layout.text_index
+        grid_info = layout.grid_info
         
-        used_texts = set()
+        available = np.ones(len(text_index), dtype=bool)
         
         for img in images:
             # 이미지가 속한 셀 계산
-            col = self._find_nearest_cluster(img['center_x'], grid_info['x_clusters'])
-            row = self._find_nearest_cluster(img['center_y'], grid_info['y_clusters'])
+            col = self._find_nearest_cluster(img.center_x, grid_info['x_clusters'])
+            row = self._find_nearest_cluster(img.center_y, grid_info['y_clusters'])
             
             # 셀 경계 계산 (여유 공간 20% 추가)
             cell_w = grid_info['cell_width']
@@ -398,53 +823,38 @@ class ProductExtractor:
             cell_bottom = (row + 1) * cell_h + cell_h * 0.1
             
             # 셀 내 텍스트 찾기
-            cell_texts = []
+            candidates = np.flatnonzero(
+                available &
+                text_index.rect_mask(cell_left, cell_top, cell_right, cell_bottom)
+            )
             
-            for idx, block in enumerate(text_blocks):
-                if idx in used_texts:
-                    continue
-                
-                # 텍스트가 셀 안에 있는지
-                if not (cell_left <= block['center_x'] <= cell_right and
-                        cell_top <= block['center_y'] <= cell_bottom):
-                    continue
-                
-                # 이미지와의 관계 분석
-                is_below = block['y'] > img['y'] + img['h']
-                is_above = block['y'] + block['h'] < img['y']
-                
-                if is_below:
-                    priority = 1
-                    distance = block['y'] - (img['y'] + img['h'])
-                elif is_above:
-                    priority = 2
-                    distance = img['y'] - (block['y'] + block['h'])
-                else:
-                    priority = 3
-                    distance = abs(block['center_y'] - img['center_y'])
-                
-                # 거리 제한
-                if distance > self.config['text_search_radius_vertical']:
-                    continue
-                
-                cell_texts.append({
-                    'text': block['text'],
-                    'priority': priority,
-                    'distance': distance,
-                    'y': block['y'],
-                    'x': block['x'],
-                    'index': idx
-                })
+            # 이미지와의 관계 분석 (아래 → 위 → 옆 순서로 우선)
+            y = text_index.y[candidates]
+            img_bottom = img.y + img.h
+            is_below = y > img_bottom
+            is_above = text_index.bottom[candidates] < img.y
+            
+            priority = np.where(is_below, 1, np.where(is_above, 2, 3))
+            distance = np.where(
+                is_below, y - img_bottom,
+                np.where(is_above, img.y - text_index.bottom[candidates],
+                         np.abs(text_index.cy[candidates] - img.center_y))
+            )
+            
+            # 거리 제한
+            within = distance <= self.config['text_search_radius_vertical']
+            candidates, priority, distance, y = (
+                candidates[within], priority[within], distance[within], y[within]
+            )
             
             # 텍스트 정렬 및 조합
-            cell_texts.sort(key=lambda t: (t['priority'], t['distance'], t['y']))
-            cell_texts = cell_texts[:self.config['max_texts_per_product']]
+            order = np.lexsort((y, distance, priority))[:self.config['max_texts_per_product']]
+            cell_texts = [text_blocks[idx].text for idx in candidates[order]]
             
-            product_info = self._build_product_info(img, cell_texts)
+            product_info = self._build_product_info(img, cell_texts, layout.xref_cache)
             
             # 사용된 텍스트 마킹
-            for t in cell_texts:
-                used_texts.add(t['index'])
+            available[candidates[order]] = False
             
             products.append(product_info)
         
@@ -454,40 +864,28 @@ class ProductExtractor:
         """구간 기반 매칭 (세로 리스트용)"""
         
         products = []
-        images = sorted(layout['images'], key=lambda x: x['y'])
-        text_blocks = layout['text_blocks']
+        images = sorted(layout.images, key=lambda x: x.y)
+        text_blocks = layout.text_blocks
+        text_index = layout.text_index
         
-        used_texts = set()
+        available = np.ones(len(text_index), dtype=bool)
         
         for i, img in enumerate(images):
             # 다음 이미지까지를 구간으로 설정
-            y_start = img['y'] - 50  # 위쪽 여유
-            y_end = images[i+1]['y'] if i < len(images)-1 else layout['page_height']
+            y_start = img.y - 50  # 위쪽 여유
+            y_end = images[i+1].y if i < len(images)-1 else layout.page_height
             
-            region_texts = []
+            candidates = np.flatnonzero(available & text_index.y_range_mask(y_start, y_end))
             
-            for idx, block in enumerate(text_blocks):
-                if idx in used_texts:
-                    continue
-                
-                if y_start <= block['y'] <= y_end:
-                    distance = abs(block['y'] - (img['y'] + img['h']))
-                    
-                    region_texts.append({
-                        'text': block['text'],
-                        'distance': distance,
-                        'y': block['y'],
-                        'x': block['x'],
-                        'index': idx
-                    })
+            y = text_index.y[candidates]
+            distance = np.abs(y - (img.y + img.h))
             
-            region_texts.sort(key=lambda t: (t['distance'], t['y']))
-            region_texts = region_texts[:self.config['max_texts_per_product']]
+            order = np.lexsort((y, distance))[:self.config['max_texts_per_product']]
+            region_texts = [text_blocks[idx].text for idx in candidates[order]]
             
-            product_info = self._build_product_info(img, region_texts)
+            product_info = self._build_product_info(img, region_texts, layout.xref_cache)
             
-            for t in region_texts:
-                used_texts.add(t['index'])
+            available[candidates[order]] = False
             
             products.append(product_info)
         
@@ -497,37 +895,29 @@ class ProductExtractor:
         """거리 기반 매칭 (기본 전략)"""
         
         products = []
-        images = layout['images']
-        text_blocks = layout['text_blocks']
-        
-        used_texts = set()
-        
-        for img in images:
-            nearby_texts = []
+        images = layout.images
+        text_blocks = layout.text_blocks
+        text_index = layout.text_index
+        
+        available = np.ones(len(text_index), dtype=bool)
+        
+        # 모든 이미지 × 모든 텍스트 거리 한 번에 계산
+        distances = text_index.center_distances(
+            [img.center_x for img in images],
+            [img.center_y for img in images]
+        )
+        
+        for img, img_distances in zip(images, distances):
+            # 300px 이내
+            candidates = np.flatnonzero(available & (img_distances < 300))
+            distance = img_distances[candidates]
             
-            for idx, block in enumerate(text_blocks):
-                if idx in used_texts:
-                    continue
-                
-                distance = ((block['center_x'] - img['center_x'])**2 + 
-                           (block['center_y'] - img['center_y'])**2)**0.5
-                
-                if distance < 300:  # 300px 이내
-                    nearby_texts.append({
-                        'text': block['text'],
-                        'distance': distance,
-                        'y': block['y'],
-                        'x': block['x'],
-                        'index': idx
-                    })
-            
-            nearby_texts.sort(key=lambda t: t['distance'])
-            nearby_texts = nearby_texts[:self.config['max_texts_per_product']]
+            order = np.argsort(distance, kind='stable')[:self.config['max_texts_per_product']]
+            nearby_texts = [text_blocks[idx].text for idx in candidates[order]]
             
-            product_info = self._build_product_info(img, nearby_texts)
+            product_info = self._build_product_info(img, nearby_texts, layout.xref_cache)
             
-            for t in nearby_texts:
-                used_texts.add(t['index'])
+            available[candidates[order]] = False
             
             products.append(product_info)
         
@@ -536,28 +926,27 @@ class ProductExtractor:
     def _extract_single_product(self, layout):
         """단일 제품 추출"""
         
-        if not layout['images']:
+        if not layout.images:
             return []
         
-        img = layout['images'][0]
-        text_blocks = layout['text_blocks']
+        img = layout.images[0]
+        text_blocks = layout.text_blocks
         
-        all_texts = [{'text': b['text'], 'y': b['y'], 'x': b['x'], 'index': i} 
-                     for i, b in enumerate(text_blocks)]
+        texts = [b.text for b in text_blocks[:15]]
         
-        product_info = self._build_product_info(img, all_texts[:15])
+        product_info = self._build_product_info(img, texts, layout.xref_cache)
         
         return [product_info]
     
-    def _build_product_info(self, img, texts):
-        """텍스트에서 제품 정보 구성"""
+    def _build_product_info(self, img, texts, xref_cache=None):
+        """텍스트(매칭 순서대로 정렬된 문자열)에서 제품 정보 구성"""
         
         # 제품명과 스펙 분리
         name_parts = []
         specs = []
         
         for t in texts:
-            clean = self._clean_text(t['text'])
+            clean = self._clean_text(t)
             
             if not clean or len(clean) < 2:
                 continue
@@ -576,7 +965,7 @@ class ProductExtractor:
                 name_parts.append(clean)
         
         # 제품명: 처음 2-3개 텍스트
-        product_name = ' '.join(name_parts[:3]) if name_parts else f'제품 {img["index"] + 1}'
+        product_name = ' '.join(name_parts[:3]) if name_parts else f'제품 {img.index + 1}'
         
         # 너무 길면 자르기
         if len(product_name) > 80:
@@ -585,14 +974,15 @@ class ProductExtractor:
         # 신뢰도 계산
         confidence = self._calculate_confidence(texts, name_parts, specs)
         
-        return {
-            'name': product_name,
-            'specs': specs[:5],
-            'details': [],
-            'image': self._image_to_base64(img['pil_image']),
-            'confidence': confidence,
-            'text_count': len(texts)
-        }
+        return Product(
+            name=product_name,
+            specs=specs[:5],
+            details=[],
+            image=None,
+            confidence=confidence,
+            text_count=len(texts),
+            image_future=self._submit_encode(self._encode_candidate_image, img, xref_cache)
+        )
     
     def _calculate_confidence(self, texts, name_parts, specs):
         """추출 신뢰도 계산"""
@@ -634,86 +1024,208 @@ class ProductExtractor:
         return nearest_idx
     
     def _extract_all_text_once(self, pdf_document):
-        """Google Vision OCR"""
-        try:
-            from google.cloud import vision
+        """전체 페이지 텍스트 선처리 (내장 텍스트 우선, 필요한 페이지만 배치 OCR)
+
+        OCR이 필요한 페이지는 렌더링하는 대로 배치에 담아 전송 → 렌더링과 OCR이 겹침
+        OCR이 실패한 페이지는 내장 텍스트 그대로
+        """
+        all_text_data = {}
+        session = self._new_ocr_session()
+        cache_keys = {}
+        
+        for page_num in range(len(pdf_document)):
+            with MUPDF_LOCK:
+                page = pdf_document[page_num]
+                all_text_data[page_num], needs_ocr = self._native_text(page, page_num)
+                if needs_ocr:
+                    with PageRaster(page, consumers=('ocr',)) as raster:
+                        img_bytes = raster.ocr_png()
+                page = raster = None
             
-            all_text_data = {}
+            if not needs_ocr:
+                continue
             
-            for page_num in range(len(pdf_document)):
-                page = pdf_document[page_num]
-                
-                zoom = 2.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat)
-                img_bytes = pix.tobytes("png")
-                
-                vision_image = vision.Image(content=img_bytes)
-                response = self.vision_client.text_detection(image=vision_image)
-                
-                if response.error.message:
-                    all_text_data[page_num] = []
-                    continue
-                
-                texts = response.text_annotations
-                if not texts:
-                    all_text_data[page_num] = []
+            cached, cache_keys[page_num] = self._ocr_cache_lookup(img_bytes, page_num)
+            if cached is not None:
+                all_text_data[page_num] = cached
+                continue
+            
+            session.add(page_num, img_bytes)
+        
+        if session is not None:
+            for page_num, text_blocks in sorted(session.results().items()):
+                if text_blocks is None:
+                    # 배치 실패 / 응답 오류 → 캐시하지 않음 (다음 요청에서 다시 OCR)
+                    print(f"   페이지 {page_num + 1}: OCR 실패 → 내장 텍스트 {len(all_text_data[page_num])}개 사용")
                     continue
-                
-                text_blocks = []
-                for text in texts[1:]:
-                    vertices = text.bounding_poly.vertices
-                    x = min(v.x for v in vertices)
-                    y = min(v.y for v in vertices)
-                    w = max(v.x for v in vertices) - x
-                    h = max(v.y for v in vertices) - y
-                    
-                    text_blocks.append({
-                        'text': text.description,
-                        'x': x,
-                        'y': y,
-                        'w': w,
-                        'h': h,
-                        'center_x': x + w/2,
-                        'center_y': y + h/2
-                    })
-                
-                all_text_data[page_num] = text_blocks
+                self._ocr_cache_store(cache_keys.get(page_num), text_blocks)
                 print(f"   페이지 {page_num + 1}: {len(text_blocks)}개 텍스트 추출")
-            
-            return all_text_data
-            
-        except Exception as e:
-            print(f"❌ OCR 오류: {e}")
-            return {}
+                all_text_data[page_num] = text_blocks
+        
+        return all_text_data
+    
+    def _new_ocr_session(self):
+        """문서 하나의 OCR 배치 세션 (Vision 미사용이면 None)"""
+        if not self.use_vision:
+            return None
+        
+        batch_ocr = get_batch_ocr(get_vision_client, self.config['ocr_max_inflight'])
+        return batch_ocr.session(
+            batch_size=self.config['ocr_batch_size'],
+            max_batch_bytes=self.config['ocr_batch_max_mb'] * 1024 * 1024,
+            deadline_seconds=self.config['ocr_deadline_seconds'],
+            max_retries=self.config['ocr_max_retries'],
+            backoff_seconds=self.config['ocr_backoff_seconds'],
+            max_wait_seconds=self.config['ocr_batch_max_wait_seconds'],
+        )
+    
+    def _native_text(self, page, page_num):
+        """페이지 내장 텍스트 → (텍스트 블록, OCR 필요 여부)
+
+        품질 검사는 OCR을 시도할지만 결정 (Vision 미사용이면 품질이 낮아도 내장 텍스트 사용)
+        text_source가 vision이면 내장 텍스트 없이 ([], Vision 사용 여부)
+        """
+        text_source = self.config['text_source']
+        
+        if text_source not in ('auto', 'native'):
+            return [], self.use_vision
+        
+        native_blocks = self._extract_native_text(page)
+        
+        if text_source == 'native' or self._is_native_text_usable(native_blocks):
+            print(f"   페이지 {page_num + 1}: 내장 텍스트 {len(native_blocks)}개 사용")
+            return native_blocks, False
+        
+        if not self.use_vision:
+            print(f"   페이지 {page_num + 1}: 내장 텍스트 품질 낮음, Vision 미사용 → {len(native_blocks)}개 그대로 사용")
+            return native_blocks, False
+        
+        print(f"   페이지 {page_num + 1}: 내장 텍스트 사용 불가 → OCR 필요")
+        return native_blocks, True
+    
+    def _extract_native_text(self, page):
+        """PDF 내장 텍스트 레이어 → 텍스트 블록 (2배 좌표계, OCR 결과와 같은 형식)"""
+        zoom = PageRaster.LAYOUT_ZOOM
+        text_blocks = []
+        
+        for x0, y0, x1, y1, word, *_ in page.get_text("words", sort=True):
+            text_blocks.append(TextBlock.from_box(
+                word, x0 * zoom, y0 * zoom, (x1 - x0) * zoom, (y1 - y0) * zoom
+            ))
+        
+        return text_blocks
+    
+    def _is_native_text_usable(self, text_blocks):
+        """내장 텍스트 품질 검사 (CID 폰트 깨짐 등)"""
+        if len(text_blocks) < self.config['native_text_min_words']:
+            return False
+        
+        total_chars = 0
+        garbled_chars = 0
+        
+        for block in text_blocks:
+            for ch in block.text:
+                total_chars += 1
+                # U+FFFD, 사설 영역(ToUnicode 없는 CID 글리프), 제어/미할당 문자
+                if ch == '\ufffd' or unicodedata.category(ch) in ('Co', 'Cc', 'Cn', 'Cs'):
+                    garbled_chars += 1
+        
+        if total_chars == 0:
+            return False
+        
+        return garbled_chars / total_chars <= self.config['native_text_max_garbled_ratio']
+    
+    def _ocr_cache_lookup(self, img_bytes, page_num, origins=None):
+        """OCR 캐시 조회 → (텍스트 블록 또는 None, 캐시 키)
+
+        영역 OCR이면 img_bytes는 영역 PNG를 이어 붙인 것, 원점도 키에 포함
+        """
+        if self.ocr_cache is None:
+            return None, None
+        
+        settings = self._ocr_settings()
+        if origins and origins != [(0, 0)]:
+            settings['origins'] = origins
+        cache_key = self.ocr_cache.make_key(img_bytes, settings)
+        cached = self.ocr_cache.get(cache_key)
+        if cached is None:
+            return None, cache_key
+        
+        print(f"   페이지 {page_num + 1}: {len(cached)}개 텍스트 (OCR 캐시)")
+        return [TextBlock(**block) for block in cached], cache_key
+    
+    def _ocr_cache_store(self, cache_key, text_blocks):
+        if cache_key is not None:
+            self.ocr_cache.put(cache_key, [block.to_dict() for block in text_blocks])
+    
+    def _ocr_settings(self):
+        """OCR 결과에 영향을 주는 설정 (캐시 키용)"""
+        return {
+            'engine': 'vision.text_detection',
+            'zoom': PageRaster.OCR_ZOOM,
+        }
     
-    def _create_debug_image(self, page_img_bytes, layout, products):
-        """디버그 이미지 생성"""
+    def _layout_overlay(self, layout):
+        """디버그 오버레이용 레이아웃 요약 (JSON 저장 가능, 2배 좌표계)"""
+        grid = layout.grid_info or {}
+        return {
+            'page_width': layout.page_width,
+            'page_height': layout.page_height,
+            'images': [[img.x, img.y, img.w, img.h] for img in layout.images],
+            'x_clusters': list(grid.get('x_clusters', [])),
+            'y_clusters': list(grid.get('y_clusters', [])),
+        }
+    
+    def _draw_debug_overlay(self, preview, scale, overlay):
+        """미리보기 복사본에 이미지 박스 / 그리드 라인 그리기"""
+        img = preview.copy()
+        draw = ImageDraw.Draw(img)
+        box_width = max(1, round(3 * scale))
+        
+        # 이미지 박스 (빨강)
+        for x, y, w, h in overlay['images']:
+            x, y, w, h = x * scale, y * scale, w * scale, h * scale
+            draw.rectangle([x, y, x+w, y+h], outline='red', width=box_width)
+        
+        # 그리드 라인 (파랑, 얇게)
+        for x in overlay['x_clusters']:
+            draw.line([(x * scale, 0), (x * scale, overlay['page_height'] * scale)], 
+                    fill='blue', width=1)
+        for y in overlay['y_clusters']:
+            draw.line([(0, y * scale), (overlay['page_width'] * scale, y * scale)], 
+                    fill='blue', width=1)
+        
+        return img
+    
+    def _create_debug_image(self, preview, scale, overlay):
+        """디버그 이미지 생성 (미리보기 해상도에 직접 그림)"""
         try:
-            img = Image.open(io.BytesIO(page_img_bytes)).convert('RGB')
-            draw = ImageDraw.Draw(img)
-            
-            # 이미지 박스 (빨강)
-            for img_data in layout['images']:
-                x, y, w, h = img_data['x'], img_data['y'], img_data['w'], img_data['h']
-                draw.rectangle([x, y, x+w, y+h], outline='red', width=3)
-            
-            # 그리드 라인 (파랑, 얇게)
-            if 'grid_info' in layout:
-                grid = layout['grid_info']
-                if 'x_clusters' in grid:
-                    for x in grid['x_clusters']:
-                        draw.line([(x, 0), (x, layout['page_height'])], 
-                                fill='blue', width=1)
-                if 'y_clusters' in grid:
-                    for y in grid['y_clusters']:
-                        draw.line([(0, y), (layout['page_width'], y)], 
-                                fill='blue', width=1)
-            
-            return self._image_to_base64(img)
+            return self._image_to_base64(self._draw_debug_overlay(preview, scale, overlay))
         except:
             return None
     
+    def render_page_image(self, pdf_path, page_num, overlay=None):
+        """저장된 PDF에서 페이지 미리보기 하나 생성 (overlay가 있으면 디버그 이미지)
+
+        추출 시 page_artifacts를 끈 결과를 나중에 확인할 때 사용 → EncodedImage
+        """
+        with MUPDF_LOCK:
+            pdf_document = _open_pdf(pdf_path)
+            try:
+                if not 0 <= page_num < len(pdf_document):
+                    raise IndexError(f'페이지 번호 범위 밖: {page_num + 1}')
+                
+                with PageRaster(pdf_document[page_num], consumers=('preview',)) as raster:
+                    image = raster.preview_image()
+                    preview_scale = raster.preview_scale
+                raster = None
+            finally:
+                pdf_document.close()
+        
+        if overlay is not None:
+            image = self._draw_debug_overlay(image, preview_scale, overlay)
+        return self._thumbnail_encoder().encode_image(image)
+    
     def _clean_text(self, text):
         """텍스트 정리"""
         if not text:
@@ -722,17 +1234,97 @@ class ProductExtractor:
         return text[:100]
     
     def _image_to_base64(self, image):
-        """이미지를 Base64로 변환"""
-        buffered = io.BytesIO()
-        image = image.convert('RGB')
-        
-        if image.width > 400:
-            ratio = 400 / image.width
-            new_height = int(image.height * ratio)
-            image = image.resize((400, new_height), Image.LANCZOS)
+        """이미지를 Base64 data URI로 변환"""
+        return self._encoded_to_base64(self._thumbnail_encoder().encode_image(image))
+    
+    def _encoded_to_base64(self, encoded):
+        return f"data:{encoded.mimetype};base64,{base64.b64encode(encoded.data).decode()}"
+    
+    def _submit_encode(self, func, *args):
+        """인코딩 작업 → Future (풀이 없으면 바로 실행)"""
+        if self.encode_pool is not None:
+            return self.encode_pool.submit(func, *args)
         
-        image.save(buffered, format="JPEG", quality=90, optimize=True)
-        return f"data:image/jpeg;base64,{base64.b64encode(buffered.getvalue()).decode()}"
+        future = Future()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _resolve_product_images(self, products):
+        """제품 썸네일 인코딩 완료 대기 → image / image_srcset 확정"""
+        for product in products:
+            if product.image_future is not None:
+                product.image, product.image_srcset = product.image_future.result()
+                product.image_future = None
+    
+    def _thumbnail_encoder(self):
+        """현재 설정의 썸네일 인코더"""
+        return ThumbnailEncoder.from_config(self.config)
+    
+    def _encode_candidate_image(self, img, xref_cache=None):
+        """이미지 후보 → (제품 이미지, srcset) (같은 xref는 문서에서 한 번만 인코딩)"""
+        if xref_cache is not None:
+            cached = xref_cache.get_thumbnail(img.xref)
+            if cached is not None:
+                return cached
+        
+        encoded = self._encode_product_image(img.image_bytes)
+        
+        if xref_cache is not None:
+            xref_cache.put_thumbnail(img.xref, encoded)
+        return encoded
+    
+    def _encode_product_image(self, image_bytes):
+        """제품 이미지 → (이미지 저장소 URL, srcset) (저장소 없으면 Base64, srcset 없음)"""
+        thumbnails = self._thumbnail_encoder().encode_bytes(image_bytes)
+        
+        if self.image_store is None:
+            return self._encoded_to_base64(thumbnails[0]), None
+        
+        urls = [self.image_store.url_for(self.image_store.put(t.data)) for t in thumbnails]
+        srcset = None
+        if len(thumbnails) > 1:
+            srcset = ', '.join(f'{url} {t.width}w' for url, t in zip(urls, thumbnails))
+        return urls[0], srcset
+
+# 병렬 처리 워커 프로세스 상태 (프로세스마다 문서를 한 번만 연다)
+_worker_document = None
+_worker_extractor = None
+_worker_xref_cache = None
+_worker_memory_guard = None
+
+
+def _open_pdf(pdf_source):
+    """파일 경로 또는 바이트 → fitz 문서"""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return fitz.open(stream=pdf_source, filetype="pdf")
+    return fitz.open(pdf_source, filetype="pdf")
+
+
+def _init_page_worker(pdf_source, config, image_store=None):
+    """워커 프로세스 초기화: 자체 fitz 문서 + 추출기 생성"""
+    global _worker_document, _worker_extractor, _worker_xref_cache, _worker_memory_guard
+    
+    _worker_document = _open_pdf(pdf_source)
+    _worker_extractor = ProductExtractor(init_vision=False, image_store=image_store)
+    _worker_extractor.config = dict(config)
+    _worker_xref_cache = _worker_extractor._new_xref_cache()
+    _worker_memory_guard = _worker_extractor._new_memory_guard(_worker_xref_cache)
+
+
+def _process_page_chunk(chunk):
+    """워커 프로세스에서 연속된 페이지 구간 처리"""
+    total_pages = len(_worker_document)
+    results = []
+    for page_num, text_blocks in chunk:
+        results.append(_worker_extractor._process_page(
+            _worker_document, page_num, total_pages, text_blocks,
+            xref_cache=_worker_xref_cache
+        ))
+        _worker_memory_guard.check()
+    return results
 
 
 # 별칭
@@ -0,0 +1,170 @@
+"""
+내용 주소 기반 이미지 저장소
+- 키: 인코딩된 이미지 바이트 SHA-256
+- 디스크 디렉터리에 저장 → 모든 gunicorn 워커가 공유
+- 용량 초과 시 오래된 파일부터 정리 (살아 있는 결과가 참조하는 이미지는 남김)
+- 결과 / 캐시가 URL로 참조하므로 재배포 후에도 남는 디렉터리(영구 볼륨)에 둘 것
+"""
+
+import base64
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+
+HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+URL_HASH_PATTERN = re.compile(r'/img/([0-9a-f]{64})$')
+
+
+class ImageStore:
+    URL_PATH = '/img/'
+
+    def __init__(self, root, max_bytes=1024 * 1024 * 1024, prune_every=200, retain_seconds=0):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+        # 이 시간 안에 저장 / 사용된 이미지는 용량을 넘어도 정리하지 않음 (결과 보관 기간)
+        self.retain_seconds = retain_seconds
+
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(root, exist_ok=True)
+
+    def __getstate__(self):
+        # 프로세스 풀 워커로 넘길 때 lock 제외
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def put(self, data):
+        """이미지 바이트 저장 → 해시"""
+        image_hash = hashlib.sha256(data).hexdigest()
+        path = self.path_for(image_hash)
+
+        if os.path.exists(path):
+            # 최근 사용 표시 (정리 순서용)
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return image_hash
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            self._puts += 1
+            should_prune = self._puts % self.prune_every == 0
+        if should_prune:
+            self.prune()
+
+        return image_hash
+
+    def touch(self, image_hashes):
+        """이미지 사용 시각 갱신 (캐시된 결과를 다시 쓸 때 → 보관 기간 동안 정리 대상에서 제외)"""
+        for image_hash in image_hashes:
+            path = self.get_path(image_hash)
+            if path is None:
+                continue
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def hash_from_url(url):
+        """저장소 이미지 URL(상대 / 절대) → 해시 (저장소 URL이 아니면 None)"""
+        match = URL_HASH_PATTERN.search(url or '')
+        return match.group(1) if match else None
+
+    def data_uri(self, image_hash):
+        """저장된 이미지 → data URI (없으면 None, 독립 실행 HTML용)"""
+        path = self.get_path(image_hash)
+        if path is None:
+            return None
+        with open(path, 'rb') as f:
+            data = f.read()
+        return f"data:{self.guess_mimetype(path)};base64,{base64.b64encode(data).decode()}"
+
+    def url_for(self, image_hash):
+        """이미지 URL (서버 기준 상대 경로)"""
+        return f"{self.URL_PATH}{image_hash}"
+
+    def path_for(self, image_hash):
+        """해시 → 파일 경로 (앞 2글자로 디렉터리 분산)"""
+        if not HASH_PATTERN.match(image_hash):
+            raise ValueError(f'잘못된 이미지 해시: {image_hash}')
+        return os.path.join(self.root, image_hash[:2], image_hash)
+
+    def get_path(self, image_hash):
+        """저장된 이미지 경로 (없으면 None)"""
+        try:
+            path = self.path_for(image_hash)
+        except ValueError:
+            return None
+        return path if os.path.exists(path) else None
+
+    @staticmethod
+    def guess_mimetype(path):
+        """파일 헤더로 이미지 형식 판별"""
+        with open(path, 'rb') as f:
+            header = f.read(12)
+
+        if header.startswith(b'\xff\xd8'):
+            return 'image/jpeg'
+        if header.startswith(b'\x89PNG'):
+            return 'image/png'
+        if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+            return 'image/webp'
+        return 'application/octet-stream'
+
+    def prune(self):
+        """용량 초과분 정리 (오래된 파일부터, max_bytes의 90%까지)
+
+        보관 기간(retain_seconds) 안에 사용된 파일은 지우지 않음 → 용량을 넘을 수 있음
+        """
+        now = time.time()
+        files = []
+        total = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 0.9
+        files.sort()
+        for mtime, size, path in files:
+            if total <= target:
+                break
+            if now - mtime < self.retain_seconds:
+                # 이후 파일은 모두 더 최근 → 살아 있는 결과가 참조할 수 있음
+                print(f"⚠️ 이미지 저장소 용량 초과: 보관 기간 안의 이미지 {total / 1024 / 1024:.0f}MB")
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
@@ -0,0 +1,121 @@
+"""
+백그라운드 작업 관리자
+- 제한된 워커 풀에서 PDF 추출 실행
+- 작업 상태 / 진행률 / 결과 조회
+- 완료된 작업은 TTL 이후 정리
+"""
+
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    """대기 중인 작업이 너무 많을 때"""
+
+
+class JobManager:
+    def __init__(self, max_workers=2, max_pending=8, ttl_seconds=3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix='pdf-job'
+        )
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, **kwargs):
+        """작업 등록 후 즉시 job id 반환
+
+        func는 마지막 키워드 인자로 progress(done, total) 콜백을 받는다.
+        """
+        with self._lock:
+            self._cleanup_locked()
+
+            active = sum(
+                1 for job in self._jobs.values()
+                if job['status'] in ('queued', 'running')
+            )
+            if active >= self.max_workers + self.max_pending:
+                raise JobQueueFull(f'대기 중인 작업이 너무 많습니다 ({active}개)')
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'pages_done': 0,
+                'pages_total': None,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None,
+            }
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """작업 상태 스냅샷 (없으면 None)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+
+            snapshot = {
+                'id': job['id'],
+                'status': job['status'],
+                'progress': {
+                    'pages_done': job['pages_done'],
+                    'pages_total': job['pages_total'],
+                },
+                'created_at': job['created_at'],
+                'started_at': job['started_at'],
+                'finished_at': job['finished_at'],
+            }
+            if job['status'] == 'done':
+                snapshot['result'] = job['result']
+            elif job['status'] == 'failed':
+                snapshot['error'] = job['error']
+            return snapshot
+
+    def _run(self, job_id, func, args, kwargs):
+        """워커 스레드에서 실제 작업 실행"""
+        with self._lock:
+            self._jobs[job_id]['status'] = 'running'
+            self._jobs[job_id]['started_at'] = time.time()
+
+        def progress(done, total):
+            with self._lock:
+                self._jobs[job_id]['pages_done'] = done
+                self._jobs[job_id]['pages_total'] = total
+
+        try:
+            result = func(*args, progress=progress, **kwargs)
+            with self._lock:
+                self._jobs[job_id]['status'] = 'done'
+                self._jobs[job_id]['result'] = result
+        except Exception as e:
+            logger.exception(f"💥 작업 실패: {job_id}")
+            with self._lock:
+                self._jobs[job_id]['status'] = 'failed'
+                self._jobs[job_id]['error'] = str(e)
+        finally:
+            with self._lock:
+                self._jobs[job_id]['finished_at'] = time.time()
+
+    def _cleanup_locked(self):
+        """TTL 지난 완료 작업 제거 (lock 보유 상태에서 호출)"""
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] and now - job['finished_at'] > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,82 @@
+"""
+프로세스 메모리(RSS) 상한
+- 페이지마다 현재 RSS 확인 (/proc/self/statm, 리눅스)
+- 상한을 넘으면 먼저 정리: gc, MuPDF 리소스 캐시 비우기, 등록된 캐시 비우기, malloc_trim
+- 정리 후에도 넘으면 MemoryCeilingExceeded → 요청 하나만 실패하고 프로세스는 유지
+"""
+
+import ctypes
+import ctypes.util
+import gc
+import os
+
+import fitz
+
+from utils.mupdf_lock import MUPDF_LOCK
+
+
+class MemoryCeilingExceeded(MemoryError):
+    """정리 후에도 RSS가 설정 상한을 넘음"""
+
+
+def current_rss_bytes():
+    """현재 프로세스 RSS (바이트, 확인할 수 없으면 None)"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load_malloc_trim():
+    """glibc malloc_trim (해제한 메모리를 OS에 바로 반환, 없으면 None)"""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+        return libc.malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+
+_malloc_trim = _load_malloc_trim()
+
+
+class MemoryGuard:
+    def __init__(self, max_rss_bytes, release_callbacks=()):
+        self.max_rss_bytes = max_rss_bytes
+        self.release_callbacks = list(release_callbacks)
+        self.peak_rss = 0
+
+    def check(self):
+        """RSS 상한 확인 (상한 0 = 제한 없음)"""
+        if not self.max_rss_bytes:
+            return
+
+        rss = current_rss_bytes()
+        if rss is None:
+            return
+        self.peak_rss = max(self.peak_rss, rss)
+        if rss <= self.max_rss_bytes:
+            return
+
+        self.release()
+        rss_after = current_rss_bytes()
+        print(f"🧹 메모리 정리: {rss / 1024 / 1024:.0f}MB → {rss_after / 1024 / 1024:.0f}MB "
+              f"(상한 {self.max_rss_bytes / 1024 / 1024:.0f}MB)")
+
+        if rss_after > self.max_rss_bytes:
+            raise MemoryCeilingExceeded(
+                f'메모리 상한 초과: {rss_after / 1024 / 1024:.0f}MB > '
+                f'{self.max_rss_bytes / 1024 / 1024:.0f}MB'
+            )
+
+    def release(self):
+        """캐시 비우기 + 가비지 컬렉션 + 해제 메모리 반환"""
+        for callback in self.release_callbacks:
+            callback()
+        # MuPDF 저장소는 프로세스 공용 → 다른 스레드의 렌더링과 겹치지 않도록
+        with MUPDF_LOCK:
+            fitz.TOOLS.store_shrink(100)
+            gc.collect()
+        if _malloc_trim is not None:
+            _malloc_trim(0)
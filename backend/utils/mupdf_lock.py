@@ -0,0 +1,11 @@
+"""
+MuPDF 프로세스 공용 잠금
+- MuPDF 컨텍스트와 리소스 저장소(글꼴 / 이미지 캐시)는 문서와 관계없이 프로세스 전체가 공유
+- PyMuPDF는 멀티스레드 사용을 지원하지 않음
+  → 모든 스레드(파이프라인 단계, 동시 작업, 요청 스레드, 메모리 정리)의 fitz 호출은 이 잠금 안에서
+- 재진입 가능: 잠금을 잡은 채로 메모리 정리를 호출해도 됨
+"""
+
+import threading
+
+MUPDF_LOCK = threading.RLock()
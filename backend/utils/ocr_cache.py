@@ -0,0 +1,145 @@
+"""
+OCR 결과 디스크 캐시 (SQLite)
+- 키: 렌더링된 페이지 바이트 해시 + OCR 설정
+- 여러 gunicorn 워커가 같은 파일 공유 (WAL 모드)
+- 용량 기준 LRU 제거, 히트/미스 카운터
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class OCRCache:
+    def __init__(self, path, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 스키마만 만들고 바로 닫음 (app import 시 실행 → gunicorn preload면 마스터 프로세스)
+        # 열린 SQLite 연결을 fork로 워커에 넘기면 안 되므로 실제 연결은 프로세스 / 스레드별로 처음 쓸 때
+        conn = self._open_connection()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS ocr_cache (
+                    key TEXT PRIMARY KEY,
+                    blocks TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute(
+                'CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_access '
+                'ON ocr_cache (last_access)'
+            )
+        finally:
+            conn.close()
+
+    def _open_connection(self):
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _connect(self):
+        """스레드 / 프로세스별 연결 (fork 이후에도 새로 연결)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = self._open_connection()
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @staticmethod
+    def make_key(img_bytes, settings):
+        """페이지 바이트 + OCR 설정 → 캐시 키"""
+        digest = hashlib.sha256(img_bytes)
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        return digest.hexdigest()
+
+    def get(self, key):
+        """캐시된 텍스트 블록 (없으면 None)"""
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT blocks FROM ocr_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    'UPDATE ocr_cache SET last_access = ? WHERE key = ?',
+                    (time.time(), key)
+                )
+        except sqlite3.Error as e:
+            print(f"⚠️ OCR 캐시 읽기 실패: {e}")
+            row = None
+
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return json.loads(row[0]) if row is not None else None
+
+    def put(self, key, blocks):
+        """텍스트 블록 저장 후 용량 초과분 제거"""
+        payload = json.dumps(blocks, ensure_ascii=False)
+        try:
+            conn = self._connect()
+            conn.execute(
+                'INSERT OR REPLACE INTO ocr_cache (key, blocks, size, last_access) '
+                'VALUES (?, ?, ?, ?)',
+                (key, payload, len(payload), time.time())
+            )
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"⚠️ OCR 캐시 저장 실패: {e}")
+
+    def _evict(self, conn):
+        """오래 안 쓴 항목부터 제거 (max_bytes의 90%까지)"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM ocr_cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 0.9
+        rows = conn.execute(
+            'SELECT key, size FROM ocr_cache ORDER BY last_access ASC'
+        ).fetchall()
+
+        expired = []
+        for key, size in rows:
+            if total <= target:
+                break
+            expired.append((key,))
+            total -= size
+
+        conn.executemany('DELETE FROM ocr_cache WHERE key = ?', expired)
+
+    def stats(self):
+        """히트/미스 카운터 + 현재 용량"""
+        try:
+            entries, size = self._connect().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr_cache'
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+
+        with self._stats_lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': entries,
+                'bytes': size,
+                'max_bytes': self.max_bytes,
+            }
@@ -0,0 +1,109 @@
+"""
+페이지 래스터 캐시
+- 페이지마다 fitz.DisplayList를 한 번만 생성
+- 소비자(OCR / 미리보기 / 디버그)가 요청할 때만 필요한 해상도로 렌더링
+- 마지막 소비자가 끝나면 해당 래스터 즉시 해제
+  (OCR이 끝나도 미리보기 소비자가 남아 있으면 DisplayList는 유지 → 파이프라인 다음 단계에서 재사용)
+"""
+
+import fitz
+from PIL import Image
+
+
+class PageRaster:
+    # 레이아웃 좌표계 (기존 2배 렌더링 기준)
+    LAYOUT_ZOOM = 2.0
+    OCR_ZOOM = 2.0
+    PREVIEW_WIDTH = 400
+
+    # 래스터 종류별 소비자
+    RASTER_CONSUMERS = {
+        'ocr': ('ocr',),
+        'preview': ('preview', 'debug'),
+    }
+
+    def __init__(self, page, consumers=('ocr', 'preview', 'debug')):
+        self.page = page
+        self._display_list = None
+        self._rasters = {}
+
+        # 래스터별 남은 소비자
+        self._pending = {
+            raster: {c for c in raster_consumers if c in consumers}
+            for raster, raster_consumers in self.RASTER_CONSUMERS.items()
+        }
+
+        layout_rect = page.rect * fitz.Matrix(self.LAYOUT_ZOOM, self.LAYOUT_ZOOM)
+        self.layout_width = layout_rect.irect.width
+        self.layout_height = layout_rect.irect.height
+
+        # 미리보기는 400px 폭으로 바로 렌더링 (원래보다 크게 확대하지는 않음)
+        self.preview_zoom = min(
+            self.LAYOUT_ZOOM, self.PREVIEW_WIDTH / page.rect.width
+        ) if page.rect.width > 0 else self.LAYOUT_ZOOM
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get_display_list(self):
+        if self._display_list is None:
+            self._display_list = self.page.get_displaylist()
+        return self._display_list
+
+    def _render(self, zoom):
+        mat = fitz.Matrix(zoom, zoom)
+        return self._get_display_list().get_pixmap(matrix=mat, alpha=False)
+
+    def ocr_png(self):
+        """OCR용 PNG 바이트 (OCR_ZOOM)"""
+        if 'ocr' not in self._rasters:
+            self._rasters['ocr'] = self._render(self.OCR_ZOOM).tobytes("png")
+        return self._rasters['ocr']
+
+    def ocr_region_png(self, region):
+        """OCR용 PNG 바이트 (영역만, OCR_ZOOM) → (PNG, 픽셀 원점)
+
+        region: 레이아웃 좌표 (x0, y0, x1, y1), 원점은 OCR 좌표를 페이지 좌표로 되돌릴 때 사용
+        """
+        x0, y0, x1, y1 = region
+        clip = fitz.Rect(x0, y0, x1, y1) / self.LAYOUT_ZOOM
+        mat = fitz.Matrix(self.OCR_ZOOM, self.OCR_ZOOM)
+        pix = self._get_display_list().get_pixmap(matrix=mat, alpha=False, clip=clip)
+        return pix.tobytes("png"), (pix.x, pix.y)
+
+    def preview_image(self):
+        """미리보기 / 디버그용 PIL 이미지 (폭 400px)
+
+        디버그 오버레이를 그릴 때는 copy() 후 사용할 것
+        """
+        if 'preview' not in self._rasters:
+            pix = self._render(self.preview_zoom)
+            self._rasters['preview'] = Image.frombytes(
+                "RGB", (pix.width, pix.height), pix.samples
+            )
+        return self._rasters['preview']
+
+    @property
+    def preview_scale(self):
+        """레이아웃 좌표 → 미리보기 좌표 배율"""
+        return self.preview_zoom / self.LAYOUT_ZOOM
+
+    def release(self, consumer):
+        """소비자 작업 완료 → 더 이상 필요 없는 래스터 해제"""
+        for raster, pending in self._pending.items():
+            pending.discard(consumer)
+            if not pending:
+                self._rasters.pop(raster, None)
+
+        if not any(self._pending.values()):
+            self._display_list = None
+
+    def close(self):
+        """모든 래스터와 DisplayList 해제"""
+        for pending in self._pending.values():
+            pending.clear()
+        self._rasters.clear()
+        self._display_list = None
@@ -0,0 +1,165 @@
+"""
+단계별 파이프라인 (생산자 / 소비자)
+- 단계마다 스레드 하나, 단계 사이는 크기 제한 큐 → 앞 단계가 너무 앞서가지 않음 (메모리 상한)
+- 단계마다 스레드 하나라 항목 순서 유지
+- 단계별 작업 / 입력 대기 / 출력 대기 시간 기록 → 병목 단계 확인
+→ 전체 시간은 단계 시간의 합이 아니라 가장 느린 단계 수준
+"""
+
+import queue
+import threading
+import time
+
+_END = object()
+
+
+class _Failure:
+    """단계에서 난 예외 (뒤 단계를 거쳐 소비자에게 전달)"""
+    __slots__ = ('error',)
+
+    def __init__(self, error):
+        self.error = error
+
+
+class StageStats:
+    def __init__(self, name):
+        self.name = name
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.starved_seconds = 0.0  # 입력 대기
+        self.blocked_seconds = 0.0  # 출력 대기 (뒤 단계가 느림)
+
+    def to_dict(self, wall_seconds):
+        return {
+            'name': self.name,
+            'items': self.items,
+            'busy_seconds': round(self.busy_seconds, 4),
+            'starved_seconds': round(self.starved_seconds, 4),
+            'blocked_seconds': round(self.blocked_seconds, 4),
+            'utilisation': round(self.busy_seconds / wall_seconds, 3) if wall_seconds > 0 else 0.0,
+        }
+
+
+class Pipeline:
+    POLL_SECONDS = 0.1
+
+    def __init__(self, stages, queue_size=2, emit_name='emit'):
+        """stages: [(이름, 함수)] 또는 [(이름, 함수, 출력 큐 크기)] 순서대로
+
+        함수는 앞 단계 결과 하나 → 결과 하나, 출력 큐 크기를 생략하면 queue_size
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self.stats = [StageStats(stage[0]) for stage in stages] + [StageStats(emit_name)]
+        self.wall_seconds = 0.0
+        self._stop = threading.Event()
+
+    def run(self, items):
+        """items를 단계에 흘려 보내고 마지막 단계 결과를 순서대로 생성
+
+        단계 예외는 소비자 쪽에서 다시 발생, 소비자가 중간에 멈추면 모든 단계 정지
+        """
+        queues = [
+            queue.Queue(maxsize=stage[2] if len(stage) > 2 else self.queue_size)
+            for stage in self.stages
+        ]
+        threads = []
+        start = time.perf_counter()
+
+        source = iter(items)
+        for i, (name, func, *_) in enumerate(self.stages):
+            inbox = queues[i - 1] if i > 0 else None
+            thread = threading.Thread(
+                target=self._run_stage,
+                args=(func, source if i == 0 else None, inbox, queues[i], self.stats[i]),
+                name=f'pipeline-{name}',
+                daemon=True,
+            )
+            thread.start()
+            threads.append(thread)
+
+        emit_stats = self.stats[-1]
+        outbox = queues[-1]
+        try:
+            while True:
+                waited = time.perf_counter()
+                item = self._get(outbox)
+                emit_stats.starved_seconds += time.perf_counter() - waited
+
+                if item is _END:
+                    break
+                if isinstance(item, _Failure):
+                    raise item.error
+
+                # 소비자가 결과를 처리하는 시간 = emit 단계 작업 시간
+                resumed = time.perf_counter()
+                yield item
+                emit_stats.busy_seconds += time.perf_counter() - resumed
+                emit_stats.items += 1
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self.wall_seconds = time.perf_counter() - start
+
+    def _run_stage(self, func, source, inbox, outbox, stats):
+        try:
+            while True:
+                waited = time.perf_counter()
+                if source is not None:
+                    item = next(source, _END)
+                else:
+                    item = self._get(inbox)
+                    if item is None:
+                        return  # 정지
+                stats.starved_seconds += time.perf_counter() - waited
+
+                if item is not _END and not isinstance(item, _Failure):
+                    started = time.perf_counter()
+                    try:
+                        item = func(item)
+                    except BaseException as e:
+                        item = _Failure(e)
+                    stats.busy_seconds += time.perf_counter() - started
+                    stats.items += 1
+
+                waited = time.perf_counter()
+                if not self._put(outbox, item):
+                    return
+                stats.blocked_seconds += time.perf_counter() - waited
+
+                if item is _END or isinstance(item, _Failure):
+                    return
+        except BaseException as e:
+            self._put(outbox, _Failure(e))
+
+    def _get(self, inbox):
+        """정지 신호를 확인하며 대기 (정지되면 None)"""
+        while not self._stop.is_set():
+            try:
+                return inbox.get(timeout=self.POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return None
+
+    def _put(self, outbox, item):
+        """큐에 자리가 날 때까지 대기 (정지되면 False)"""
+        while not self._stop.is_set():
+            try:
+                outbox.put(item, timeout=self.POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def summary(self):
+        return [stats.to_dict(self.wall_seconds) for stats in self.stats]
+
+    def log(self):
+        print(f"\n⏱️ 파이프라인 단계별 사용률 (전체 {self.wall_seconds:.2f}초)")
+        for stage in self.summary():
+            print(
+                f"   {stage['name']:<10} {stage['utilisation']:6.1%}  "
+                f"작업 {stage['busy_seconds']:.2f}초 / 입력 대기 {stage['starved_seconds']:.2f}초 / "
+                f"출력 대기 {stage['blocked_seconds']:.2f}초 ({stage['items']}개)"
+            )
@@ -0,0 +1,123 @@
+"""
+추출 파이프라인 레코드 (slots 데이터클래스)
+- 파이프라인 내부에서는 속성 접근만 사용
+- dict 변환은 API 경계(페이지 결과, OCR 캐시)에서만
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, List, Optional
+
+
+@dataclass(slots=True)
+class TextBlock:
+    """텍스트 블록 (2배 좌표계)"""
+    text: str
+    x: float
+    y: float
+    w: float
+    h: float
+    center_x: float
+    center_y: float
+
+    @classmethod
+    def from_box(cls, text, x, y, w, h):
+        return cls(text, x, y, w, h, x + w/2, y + h/2)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class ImageCandidate:
+    """페이지 위 이미지 배치 하나 (2배 좌표계)"""
+    xref: int
+    index: int
+    placement: int
+    x: float
+    y: float
+    w: float
+    h: float
+    transform: Any
+    actual_width: int
+    actual_height: int
+    area: int
+    aspect_ratio: float
+    image_bytes: bytes
+    hash: str
+    center_x: float = 0.0
+    center_y: float = 0.0
+
+
+@dataclass(slots=True)
+class PageLayout:
+    """페이지 레이아웃 분석 결과"""
+    type: str
+    grid_cols: int
+    grid_rows: int
+    images: List[ImageCandidate]
+    text_blocks: List[TextBlock]
+    text_index: Any
+    xref_cache: Any
+    page_width: int
+    page_height: int
+    grid_info: Optional[dict] = None
+
+
+@dataclass(slots=True)
+class Product:
+    """추출된 제품"""
+    name: str
+    specs: List[str]
+    details: List[str]
+    image: Optional[str]
+    confidence: float
+    text_count: int
+    image_srcset: Optional[str] = None
+    # 인코딩 중인 썸네일 Future → (image, image_srcset), 페이지 마무리 때 확정
+    image_future: Any = None
+
+    def to_dict(self):
+        data = {
+            'name': self.name,
+            'specs': self.specs,
+            'details': self.details,
+            'image': self.image,
+            'confidence': self.confidence,
+            'text_count': self.text_count,
+        }
+        if self.image_srcset:
+            data['image_srcset'] = self.image_srcset
+        return data
+
+
+@dataclass(slots=True)
+class EncodedImage:
+    """인코딩된 썸네일 하나"""
+    data: bytes
+    mimetype: str
+    width: int
+    height: int
+
+
+@dataclass(slots=True)
+class PageWork:
+    """파이프라인 단계 사이를 넘겨지는 페이지 하나의 작업 상태"""
+    page_num: int
+    text_blocks: Optional[List[TextBlock]] = None
+    # OCR 배치 세션에 넣은 이미지 키 (text 단계에서 결과 수집)
+    ocr_keys: Optional[list] = None
+    # OCR 이미지별 픽셀 원점 (전체 페이지면 [(0, 0)], 영역 OCR이면 영역마다)
+    ocr_origins: Optional[list] = None
+    ocr_cache_key: Optional[str] = None
+    # OCR 렌더링에 쓴 PageRaster (미리보기가 필요하면 inventory 단계가 DisplayList 재사용)
+    raster: Any = None
+    images: Optional[List[ImageCandidate]] = None
+    page_width: int = 0
+    page_height: int = 0
+    preview: Any = None
+    preview_scale: float = 1.0
+    layout: Optional[PageLayout] = None
+    overlay: Optional[dict] = None
+    products: Optional[List[Product]] = None
+    page_image_future: Any = None
+    debug_image_future: Any = None
@@ -0,0 +1,92 @@
+"""
+문서 단위 추출 결과 캐시
+- 키: PDF 바이트 SHA-256 + 추출기 설정
+- 같은 문서가 동시에 올라오면 진행 중인 계산 하나를 함께 기다림
+- 항목 수 기준 LRU
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+
+class ResultCache:
+    def __init__(self, max_entries=8):
+        self.max_entries = max_entries
+
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def source_hash(pdf_source):
+        """PDF (바이트 또는 파일 경로) → 내용 SHA-256"""
+        if isinstance(pdf_source, (bytes, bytearray)):
+            digest = hashlib.sha256(pdf_source)
+        else:
+            with open(pdf_source, 'rb') as f:
+                digest = hashlib.file_digest(f, 'sha256')
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(source_hash, config):
+        """PDF 내용 해시(source_hash) + 설정 → 캐시 키"""
+        digest = hashlib.sha256(source_hash.encode())
+        digest.update(json.dumps(config, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def get_or_compute(self, key, compute):
+        """캐시에 있으면 바로 반환, 계산 중이면 대기, 없으면 직접 계산"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+
+            future = self._inflight.get(key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[key] = future
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not is_owner:
+            print("⏳ 같은 문서 처리 중 → 결과 대기")
+            return future.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        future.set_result(result)
+        return result
+
+    def stats(self):
+        """히트 / 미스 / 합류 카운터"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+            }
@@ -0,0 +1,169 @@
+"""
+추출 결과 저장소
+- 결과 하나당 디렉터리 하나 (result id)
+- 디스크에 저장 → 어느 gunicorn 워커에서든 페이지 조회 가능
+- 원본 PDF / 페이지 레이아웃도 함께 보관 → 디버그 이미지 등 나중에 생성
+  원본은 내용 해시당 한 벌 (sources/<해시>.pdf), 결과 디렉터리에는 하드 링크
+- TTL 지난 결과 정리
+"""
+
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+RESULT_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+SOURCE_HASH_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+
+
+class ResultStore:
+    RESULT_FILE = 'result.json'
+    PAGES_FILE = 'pages.json'
+    SOURCE_FILE = 'source.pdf'
+    SOURCES_DIR = 'sources'
+    # 공유 원본을 만든 뒤 결과 디렉터리에 링크하기 전까지의 여유 (그 사이 정리되지 않도록)
+    SOURCE_GRACE_SECONDS = 60
+
+    def __init__(self, root, ttl_seconds=24 * 3600):
+        self.root = root
+        self.ttl_seconds = ttl_seconds
+        self.sources_dir = os.path.join(root, self.SOURCES_DIR)
+        os.makedirs(self.sources_dir, exist_ok=True)
+
+    def create(self):
+        """새 결과 디렉터리 생성 → result id"""
+        self.cleanup()
+
+        result_id = uuid.uuid4().hex
+        os.makedirs(self.result_dir(result_id))
+        return result_id
+
+    def save(self, result_id, data, name=RESULT_FILE):
+        """결과 JSON 저장 (임시 파일 → 교체)"""
+        self.save_bytes(result_id, name, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def save_bytes(self, result_id, name, data):
+        """결과 디렉터리에 파일 저장 (임시 파일 → 교체)"""
+        directory = self.result_dir(result_id)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def save_source(self, result_id, source_hash, source_path):
+        """원본 PDF 보관 → 결과 디렉터리의 SOURCE_FILE
+
+        같은 내용은 sources/<해시>.pdf 한 벌만 복사하고 결과 디렉터리에는 하드 링크
+        (하드 링크를 못 쓰는 파일 시스템이면 복사)
+        """
+        if not SOURCE_HASH_PATTERN.match(source_hash):
+            raise ValueError(f'잘못된 원본 해시: {source_hash}')
+
+        shared_path = os.path.join(self.sources_dir, f'{source_hash}.pdf')
+        if not os.path.isfile(shared_path):
+            self._copy_replace(source_path, self.sources_dir, shared_path)
+        else:
+            # 정리 대기 시간 기준 갱신
+            os.utime(shared_path)
+
+        directory = self.result_dir(result_id)
+        target_path = os.path.join(directory, self.SOURCE_FILE)
+        tmp_path = os.path.join(directory, f'{self.SOURCE_FILE}.{uuid.uuid4().hex}.tmp')
+        try:
+            os.link(shared_path, tmp_path)
+            os.replace(tmp_path, target_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._copy_replace(shared_path, directory, target_path)
+
+    def _copy_replace(self, source_path, directory, target_path):
+        """파일 복사 (같은 디렉터리의 임시 파일 → 교체)"""
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, target_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def load(self, result_id, name=RESULT_FILE):
+        """저장된 결과 (없거나 만료되면 None)"""
+        path = self.file_path(result_id, name)
+        if path is None:
+            return None
+
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def file_path(self, result_id, name):
+        """결과 디렉터리 안 파일 경로 (잘못된 ID거나 파일이 없거나 만료되면 None)
+
+        만료 기준은 cleanup과 같음 (디렉터리 수정 시각 + ttl_seconds), 삭제는 cleanup에서
+        """
+        if not RESULT_ID_PATTERN.match(result_id):
+            return None
+
+        directory = self.result_dir(result_id)
+        try:
+            if time.time() - os.path.getmtime(directory) > self.ttl_seconds:
+                return None
+        except OSError:
+            return None
+
+        path = os.path.join(directory, name)
+        return path if os.path.isfile(path) else None
+
+    def result_dir(self, result_id):
+        if not RESULT_ID_PATTERN.match(result_id):
+            raise ValueError(f'잘못된 결과 ID: {result_id}')
+        return os.path.join(self.root, result_id)
+
+    def cleanup(self):
+        """TTL 지난 결과 디렉터리 삭제 → 더 이상 링크되지 않은 공유 원본 삭제"""
+        now = time.time()
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return
+
+        for name in names:
+            if not RESULT_ID_PATTERN.match(name):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                if now - os.path.getmtime(path) > self.ttl_seconds:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+        self._cleanup_sources(now)
+
+    def _cleanup_sources(self, now):
+        """결과 디렉터리의 링크가 모두 사라진 공유 원본 삭제 (링크 수 1 = 자기 자신만)"""
+        try:
+            names = os.listdir(self.sources_dir)
+        except OSError:
+            return
+
+        for name in names:
+            path = os.path.join(self.sources_dir, name)
+            try:
+                stat = os.stat(path)
+                if stat.st_nlink <= 1 and now - stat.st_mtime > self.SOURCE_GRACE_SECONDS:
+                    os.remove(path)
+            except OSError:
+                continue
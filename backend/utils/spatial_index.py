@@ -0,0 +1,40 @@
+"""
+텍스트 블록 좌표 인덱스 (NumPy 배열 기반)
+- 페이지마다 x, y, w, h, center_x, center_y 배열을 한 번만 생성
+- 매칭 전략은 마스크 / 브로드캐스트로 후보를 한 번에 선택
+- 블록 인덱스는 원래 text_blocks 순서 → 기존 매칭 결과와 동일
+"""
+
+import numpy as np
+
+
+class TextBlockIndex:
+    def __init__(self, text_blocks):
+        self.text_blocks = text_blocks
+
+        coords = np.array(
+            [(b.x, b.y, b.w, b.h, b.center_x, b.center_y)
+             for b in text_blocks],
+            dtype=np.float64
+        ).reshape(-1, 6)
+
+        self.x, self.y, self.w, self.h, self.cx, self.cy = np.ascontiguousarray(coords.T)
+        self.bottom = self.y + self.h
+
+    def __len__(self):
+        return len(self.text_blocks)
+
+    def rect_mask(self, left, top, right, bottom):
+        """중심점이 사각형 안(경계 포함)에 있는 블록 마스크"""
+        return ((self.cx >= left) & (self.cx <= right) &
+                (self.cy >= top) & (self.cy <= bottom))
+
+    def y_range_mask(self, y_start, y_end):
+        """블록 상단 y가 [y_start, y_end] 안에 있는 블록 마스크"""
+        return (self.y >= y_start) & (self.y <= y_end)
+
+    def center_distances(self, points_x, points_y):
+        """점 여러 개 × 모든 블록 중심 거리 행렬 (len(points), len(blocks))"""
+        dx = np.asarray(points_x, dtype=np.float64)[:, None] - self.cx[None, :]
+        dy = np.asarray(points_y, dtype=np.float64)[:, None] - self.cy[None, :]
+        return np.sqrt(dx * dx + dy * dy)
@@ -0,0 +1,70 @@
+"""
+시작 시간 측정
+- 무거운 모듈(fitz, PIL, numpy, Vision/gRPC)은 처음 쓸 때 import
+- import / 초기화 단계별 소요 시간 기록 → 로그와 /health에서 확인
+"""
+
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# 이 모듈이 처음 import된 시각 (app.py가 가장 먼저 import → 프로세스 시작 기준점)
+PROCESS_START = time.perf_counter()
+
+
+class StartupReport:
+    def __init__(self):
+        self._phases = []
+        self._lock = threading.Lock()
+        self.first_request_seconds = None
+
+    @contextmanager
+    def measure(self, name):
+        """단계 하나 소요 시간 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name, seconds):
+        with self._lock:
+            self._phases.append({
+                'name': name,
+                'seconds': round(seconds, 4),
+                'pid': os.getpid(),
+            })
+
+    def timed_import(self, module_name):
+        """모듈 import + 소요 시간 기록 (이미 import됐으면 기록 안 함)"""
+        if module_name in sys.modules:
+            return sys.modules[module_name]
+        with self.measure(f'import {module_name}'):
+            return importlib.import_module(module_name)
+
+    def mark_first_request(self):
+        """첫 요청 수신 시각 (프로세스 시작 기준)"""
+        if self.first_request_seconds is None:
+            self.first_request_seconds = round(time.perf_counter() - PROCESS_START, 4)
+
+    def summary(self):
+        with self._lock:
+            phases = list(self._phases)
+        return {
+            'phases': phases,
+            'total_seconds': round(sum(p['seconds'] for p in phases), 4),
+            'first_request_seconds': self.first_request_seconds,
+        }
+
+    def log(self, logger):
+        summary = self.summary()
+        logger.info("⏱️ 시작 시간 보고")
+        for phase in summary['phases']:
+            logger.info(f"   {phase['name']:<32} {phase['seconds'] * 1000:8.1f}ms (pid {phase['pid']})")
+        logger.info(f"   {'합계':<32} {summary['total_seconds'] * 1000:8.1f}ms")
+
+
+startup_report = StartupReport()
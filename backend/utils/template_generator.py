@@ -148,7 +148,7 @@ class TemplateGenerator:
             
             list.innerHTML = filtered.map(p => `
                 <div class="product-item">
-                    <img src="${{p.images?.[0] || p.image || ''}}" class="product-thumbnail" alt="${{p.name}}">
+                    <img src="${{p.images?.[0] || p.image || ''}}" srcset="${{p.imageSrcset || ''}}" class="product-thumbnail" alt="${{p.name}}">
                     <h3>${{p.name}}</h3>
                     <p><strong>제품번호:</strong> ${{p.productNumber || 'N/A'}}</p>
                     <div>
@@ -497,7 +497,7 @@ class TemplateGenerator:
         const list = document.getElementById('manageList');
         list.innerHTML = allProducts.map((p, idx) => `
             <div class="product-item" style="cursor: pointer;" onclick="editProduct(${{idx}})">
-                <img src="${{p.images?.[0] || p.image || ''}}" class="product-thumbnail" alt="${{p.name}}">
+                <img src="${{p.images?.[0] || p.image || ''}}" srcset="${{p.imageSrcset || ''}}" class="product-thumbnail" alt="${{p.name}}">
                 <h3>${{p.name}}</h3>
                 <p><strong>제품번호:</strong> ${{p.productNumber || 'N/A'}}</p>
                 <button onclick="event.stopPropagation(); deleteProduct(${{idx}})" style="background: #f44336; color: white; border: none; padding: 8px 15px; border-radius: 4px; cursor: pointer; margin-top: 10px;">삭제</button>
@@ -0,0 +1,130 @@
+"""
+썸네일 인코더
+- 큰 JPEG는 디코딩 단계에서 DCT 축소 (Image.draft) → 전체 해상도 디코딩 생략
+- 그 외 큰 이미지는 reduce()로 정수배 축소 후 LANCZOS 리사이즈
+- 코덱 / 품질 설정 (JPEG, WebP), optimize는 기본 끔 (인코딩 시간 약 2배)
+- 이미 작고 가벼운 JPEG(픽셀당 바이트가 낮음)는 재인코딩 없이 원본 바이트 그대로 사용
+- srcset용 여러 폭 변형 (선택)
+"""
+
+import io
+
+from PIL import Image
+
+from utils.records import EncodedImage
+
+
+class ThumbnailEncoder:
+    # codec → (Pillow 포맷, MIME)
+    FORMATS = {
+        'jpeg': ('JPEG', 'image/jpeg'),
+        'webp': ('WEBP', 'image/webp'),
+    }
+
+    def __init__(self, width=400, codec='jpeg', quality=90, optimize=False,
+                 passthrough_max_bytes=0, passthrough_max_bpp=0.3, variant_widths=()):
+        if codec not in self.FORMATS:
+            raise ValueError(f'지원하지 않는 썸네일 코덱: {codec}')
+
+        self.width = width
+        self.codec = codec
+        self.quality = quality
+        self.optimize = optimize
+        self.passthrough_max_bytes = passthrough_max_bytes
+        self.passthrough_max_bpp = passthrough_max_bpp
+        self.variant_widths = sorted({w for w in variant_widths if w != width}, reverse=True)
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            width=config['thumbnail_width'],
+            codec=config['thumbnail_format'],
+            quality=config['thumbnail_quality'],
+            optimize=config['thumbnail_optimize'],
+            passthrough_max_bytes=config['thumbnail_passthrough_kb'] * 1024,
+            passthrough_max_bpp=config['thumbnail_passthrough_max_bpp'],
+            variant_widths=config['thumbnail_srcset_widths'],
+        )
+
+    @property
+    def mimetype(self):
+        return self.FORMATS[self.codec][1]
+
+    def encode_bytes(self, image_bytes):
+        """원본 이미지 바이트 → [기본 썸네일, 변형들...] (변형은 원본보다 좁은 폭만)"""
+        image = Image.open(io.BytesIO(image_bytes))
+        source_width, source_height = image.size
+        main_width = min(self.width, source_width)
+        variant_widths = [w for w in self.variant_widths if w < source_width]
+
+        main = None
+        widths = list(variant_widths)
+        if self._can_passthrough(image, image_bytes):
+            main = EncodedImage(image_bytes, 'image/jpeg', source_width, source_height)
+        else:
+            widths.append(main_width)
+
+        if not widths:
+            return [main]
+
+        # 필요한 가장 큰 폭까지만 디코딩 (JPEG: 1/2, 1/4, 1/8 DCT 축소)
+        largest = max(widths)
+        if image.format == 'JPEG':
+            image.draft(None, (largest, max(1, round(source_height * largest / source_width))))
+
+        image = self._prepare_mode(image)
+
+        encoded = {}
+        for width in sorted(set(widths), reverse=True):
+            resized = self._resize(image, width)
+            encoded[width] = self._save(resized)
+            # 다음(더 좁은) 폭은 방금 줄인 이미지에서 시작
+            image = resized
+
+        if main is None:
+            main = encoded[main_width]
+        return [main] + [encoded[w] for w in variant_widths]
+
+    def encode_image(self, image):
+        """이미 디코딩된 PIL 이미지 → 기본 썸네일 하나"""
+        return self._save(self._resize(self._prepare_mode(image), self.width))
+
+    def _can_passthrough(self, image, image_bytes):
+        """작고 가벼운 RGB / 그레이스케일 JPEG는 원본 바이트 그대로 사용
+
+        파일 크기만 보면 고품질 원본(픽셀당 바이트가 큼)이 재인코딩 결과보다 커질 수 있음
+        → 픽셀당 바이트가 재인코딩 수준 이하인 원본만 (인코딩 없이 판단)
+        """
+        return (
+            image.format == 'JPEG'
+            and image.mode in ('RGB', 'L')
+            and image.width <= self.width
+            and len(image_bytes) <= self.passthrough_max_bytes
+            and len(image_bytes) <= self.passthrough_max_bpp * image.width * image.height
+        )
+
+    def _prepare_mode(self, image):
+        if self.codec == 'webp' and ('A' in image.getbands() or 'transparency' in image.info):
+            return image.convert('RGBA')
+        return image.convert('RGB')
+
+    def _resize(self, image, width):
+        if image.width <= width:
+            return image
+
+        # 정수배 축소 먼저 (LANCZOS 품질 유지를 위해 목표의 2배 이상일 때만)
+        factor = image.width // (width * 2)
+        if factor >= 2:
+            image = image.reduce(factor)
+
+        height = max(1, int(image.height * width / image.width))
+        return image.resize((width, height), Image.LANCZOS)
+
+    def _save(self, image):
+        pil_format, mimetype = self.FORMATS[self.codec]
+        buffered = io.BytesIO()
+        if self.codec == 'jpeg':
+            image.save(buffered, format=pil_format, quality=self.quality, optimize=self.optimize)
+        else:
+            image.save(buffered, format=pil_format, quality=self.quality)
+        return EncodedImage(buffered.getvalue(), mimetype, image.width, image.height)
@@ -0,0 +1,56 @@
+"""
+업로드 임시 파일
+- 업로드 PDF를 메모리로 읽지 않고 디스크 파일로 복사 (청크 단위)
+- MuPDF는 파일 경로로 열어 필요한 부분만 읽음
+- 처리가 끝나면 삭제, 프로세스가 죽어 남은 파일은 다음 정리 때 삭제
+"""
+
+import os
+import tempfile
+import time
+
+
+class UploadSpool:
+    PREFIX = 'upload-'
+    SUFFIX = '.pdf'
+
+    def __init__(self, root, max_age_seconds=6 * 3600):
+        self.root = root
+        self.max_age_seconds = max_age_seconds
+        os.makedirs(root, exist_ok=True)
+
+    def save(self, file_storage):
+        """업로드 파일 → 임시 파일 경로"""
+        fd, path = tempfile.mkstemp(dir=self.root, prefix=self.PREFIX, suffix=self.SUFFIX)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                file_storage.save(f)
+        except Exception:
+            self.remove(path)
+            raise
+        return path
+
+    def remove(self, path):
+        """임시 파일 삭제 (이미 없으면 무시)"""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def cleanup(self):
+        """오래된 임시 파일 삭제 (비정상 종료로 남은 파일)"""
+        now = time.time()
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return
+
+        for name in names:
+            if not (name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                if now - os.path.getmtime(path) > self.max_age_seconds:
+                    os.remove(path)
+            except OSError:
+                continue
@@ -0,0 +1,60 @@
+"""
+Google Vision 클라이언트 (프로세스당 하나)
+- 처음 사용할 때 한 번만 생성 → gRPC 채널을 모든 요청 / 스레드가 재사용
+- 자격 증명 없음도 캐시 → 요청마다 import / 파일 쓰기 / 환경변수 변경 없음
+- fork 이후(gunicorn 워커)에는 새 프로세스에서 다시 생성 (gRPC 채널은 fork 불가)
+"""
+
+import json
+import os
+import threading
+
+KEY_FILE = 'google-vision-key.json'
+
+_lock = threading.Lock()
+_client_pid = None
+_client = None
+
+
+def _create_client():
+    """자격 증명으로 ImageAnnotatorClient 생성 (없으면 예외)
+
+    자격 증명을 먼저 확인 → 없으면 무거운 vision / gRPC import 생략
+    """
+    credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
+    has_key_file = os.path.exists(KEY_FILE)
+    if not (credentials_json or has_key_file or os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')):
+        raise Exception("No credentials found")
+
+    from google.cloud import vision
+
+    if credentials_json:
+        from google.oauth2 import service_account
+        credentials = service_account.Credentials.from_service_account_info(
+            json.loads(credentials_json)
+        )
+        return vision.ImageAnnotatorClient(credentials=credentials)
+    if has_key_file:
+        return vision.ImageAnnotatorClient.from_service_account_file(KEY_FILE)
+    return vision.ImageAnnotatorClient()
+
+def get_vision_client():
+    """프로세스 공용 Vision 클라이언트 (사용할 수 없으면 None)"""
+    global _client_pid, _client
+
+    pid = os.getpid()
+    if _client_pid == pid:
+        return _client
+
+    with _lock:
+        if _client_pid != pid:
+            try:
+                _client = _create_client()
+                print("✅ Google Vision API 활성화\n")
+            except Exception as e:
+                _client = None
+                print(f"⚠️ Vision API 비활성화: {e}")
+                print("   → 제품명 추출이 제한될 수 있습니다\n")
+            _client_pid = pid
+        return _client
+
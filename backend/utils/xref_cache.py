@@ -0,0 +1,105 @@
+"""
+문서 단위 이미지 xref 캐시
+- 같은 xref(브랜드 로고, NEW 배지, 공용 액세서리 사진 등)는 문서에서 한 번만
+  추출 / 해시 / 썸네일 인코딩
+- 메타데이터, 해시, 원본 바이트, 인코딩 썸네일을 함께 보관
+- 용량(원본 바이트 + 썸네일) 기준 LRU
+"""
+
+import threading
+from collections import OrderedDict
+
+
+class XrefCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()  # xref → {'actual_width', 'actual_height', 'hash', 'image_bytes', 'thumbnail'}
+        # thumbnail: (이미지 URL 또는 data URI, srcset 또는 None)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, xref):
+        """캐시된 이미지 정보 (메타데이터 + 해시 + 원본 바이트), 없으면 None"""
+        with self._lock:
+            entry = self._entries.get(xref)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(xref)
+            self.hits += 1
+            return {
+                'actual_width': entry['actual_width'],
+                'actual_height': entry['actual_height'],
+                'hash': entry['hash'],
+                'image_bytes': entry['image_bytes'],
+            }
+
+    def put(self, xref, image_bytes, actual_width, actual_height, image_hash):
+        """추출한 이미지 정보 저장"""
+        with self._lock:
+            if xref in self._entries:
+                return
+
+            self._entries[xref] = {
+                'actual_width': actual_width,
+                'actual_height': actual_height,
+                'hash': image_hash,
+                'image_bytes': image_bytes,
+                'thumbnail': None,
+            }
+            self._size += len(image_bytes)
+            self._evict_locked()
+
+    def get_thumbnail(self, xref):
+        """캐시된 인코딩 썸네일 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(xref)
+            if entry is None or entry['thumbnail'] is None:
+                return None
+            self._entries.move_to_end(xref)
+            return entry['thumbnail']
+
+    def put_thumbnail(self, xref, thumbnail):
+        """인코딩된 썸네일 (이미지, srcset) 저장 (이미지 정보가 캐시에 있을 때만)"""
+        with self._lock:
+            entry = self._entries.get(xref)
+            if entry is None or entry['thumbnail'] is not None:
+                return
+
+            entry['thumbnail'] = thumbnail
+            self._size += self._thumbnail_size(thumbnail)
+            self._entries.move_to_end(xref)
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """용량 초과 시 오래 안 쓴 xref부터 제거 (가장 최근 항목은 유지)"""
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            _, entry = self._entries.popitem(last=False)
+            self._size -= len(entry['image_bytes'])
+            self._size -= self._thumbnail_size(entry['thumbnail'])
+
+    @staticmethod
+    def _thumbnail_size(thumbnail):
+        if thumbnail is None:
+            return 0
+        return sum(len(part or '') for part in thumbnail)
+
+    def clear(self):
+        """모든 항목 제거 (메모리 정리용, 이후 xref는 다시 추출)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'xrefs': len(self._entries),
+                'bytes': self._size,
+            }
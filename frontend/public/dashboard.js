@@ -4,6 +4,7 @@ const API_URL = 'https://catamaster-production.up.railway.app';
 const MAX_FILE_SIZE_MB = 50;
 const MAX_UPLOADS_PER_IP = 2;
 let generatedFiles = null;
+let siteUrls = null;
 
 // 업로드 횟수 체크 (localStorage 사용)
 function checkUploadLimit() {
@@ -144,6 +145,8 @@ async function uploadPDF(file) {
             'index.html': result.index_html,
             'admin.html': result.admin_html
         };
+        // 다운로드용 HTML (이미지 포함)은 서버에서 생성
+        siteUrls = result.site_urls || null;
 
         // 업로드 성공 시 카운트 증가
         incrementUploadCount();
@@ -235,6 +238,14 @@ window.switchPreview = function(type) {
 };
 
 window.downloadFile = function(filename) {
+    if (siteUrls && siteUrls[filename]) {
+        const a = document.createElement('a');
+        a.href = `${API_URL}${siteUrls[filename]}`;
+        a.download = filename;
+        a.click();
+        return;
+    }
+    
     if (!generatedFiles || !generatedFiles[filename]) return;
     
     const content = generatedFiles[filename];